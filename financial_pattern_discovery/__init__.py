@@ -5,13 +5,7 @@ A comprehensive system for automated pattern discovery in financial Excel report
 using unsupervised learning, TF-IDF clustering, and fuzzy matching.
 """
 
-from .config import ClusteringConfig, ProcessingConfig, FinancialTerms
-from .extractor import FinancialTermExtractor
-from .clustering import FinancialTermClustering
-from .canonical import CanonicalNameGenerator
-from .fuzzy_matcher import FuzzyMatcher
-from .report_generator import ExcelReportGenerator
-from .main import FinancialPatternDiscovery
+from importlib import import_module
 
 __version__ = "1.0.0"
 __author__ = "Financial Pattern Discovery Team"
@@ -26,4 +20,32 @@ __all__ = [
     "CanonicalNameGenerator",
     "FuzzyMatcher",
     "ExcelReportGenerator"
-]
\ No newline at end of file
+]
+
+# Public names and the submodules defining them. They are imported on first
+# access, so importing a light submodule (e.g. .files) does not pull in
+# NLTK, scikit-learn and pandas.
+_EXPORTS = {
+    "FinancialPatternDiscovery": ".main",
+    "ClusteringConfig": ".config",
+    "ProcessingConfig": ".config",
+    "FinancialTerms": ".config",
+    "FinancialTermExtractor": ".extractor",
+    "FinancialTermClustering": ".clustering",
+    "CanonicalNameGenerator": ".canonical",
+    "FuzzyMatcher": ".fuzzy_matcher",
+    "ExcelReportGenerator": ".report_generator",
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
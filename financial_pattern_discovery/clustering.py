@@ -28,18 +28,13 @@ class FinancialTermClustering:
     def cluster_terms(self, terms: List[str]) -> Dict[str, Any]:
         """Cluster financial terms with class-aware separation"""
         
-        if len(terms) < 2:
-            return {"clusters": {}, "metrics": {}, "vectorizer": None}
-        
         # Remove exact duplicates while preserving order
-        seen = set()
-        unique_terms = []
-        for term in terms:
-            if term not in seen:
-                seen.add(term)
-                unique_terms.append(term)
+        unique_terms = list(dict.fromkeys(terms))
+        
+        if not unique_terms:
+            return {"clusters": {}, "metrics": {}, "vectorizer": None}
         
-        self.logger.info(f"Clustering {len(unique_terms)} unique terms from {len(terms)} total terms")
+        self.logger.info(f"Clustering {len(unique_terms)} unique terms")
         
         # If we have very few unique terms, create simple clusters
         if len(unique_terms) <= 3:
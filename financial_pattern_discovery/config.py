@@ -13,7 +13,7 @@ class NLTKConfig:
     # Core NLTK features
     use_lemmatization: bool = True
     use_pos_tagging: bool = True
-    use_named_entity_recognition: bool = True
+    use_named_entity_recognition: bool = True  # Kept for saved configs; entities are scored via financial_entity_patterns
     
     # Financial domain customization
     financial_stopwords_to_remove: Set[str] = field(default_factory=lambda: {
@@ -106,13 +106,14 @@ class ClusteringConfig:
 class ProcessingConfig:
     """Configuration for data processing"""
     chunk_size: int = 10000
-    max_workers: int = 4
+    max_workers: int = 1  # Extraction worker processes; 1 = serial
     output_format: str = 'xlsx'
     temp_dir: Path = Path('./temp')
     fuzzy_threshold: int = 70  # Lowered from 80 for more inclusive matching
     memory_threshold: float = 0.8
     exclude_generic_canonicals: bool = True
     exclude_low_priority_canonicals: bool = True
+    fast_writer: bool = False  # Write reports with xlsxwriter when installed
     
     # NLTK configuration
     nltk_config: NLTKConfig = field(default_factory=NLTKConfig)
@@ -122,6 +123,11 @@ class ProcessingConfig:
     max_term_length: int = 150
     numeric_content_threshold: float = 0.7  # Max ratio of numbers to characters
     
+    # Sheet scan bounds for header detection
+    max_header_scan_rows: int = 200
+    max_header_scan_columns: int = 64  # Headers beyond column BL are very rare
+    max_empty_header_rows: int = 50  # Stop after this many consecutive rows without headers
+    
     # Enhanced financial context detection
     require_financial_context: bool = True
     financial_context_threshold: float = 0.3
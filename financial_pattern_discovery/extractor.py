@@ -4,9 +4,13 @@ Enhanced Excel term extraction module with NLTK integration
 
 import re
 import logging
+import zipfile
+from functools import lru_cache
+from itertools import groupby
 from pathlib import Path
-from typing import List, Set, Dict, Tuple
+from typing import List, Set, Dict, Tuple, FrozenSet, Optional, Pattern
 from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
 
 # NLTK imports with graceful fallback
 try:
@@ -15,8 +19,6 @@ try:
     from nltk.corpus import stopwords
     from nltk.stem import WordNetLemmatizer
     from nltk.tag import pos_tag
-    from nltk.chunk import ne_chunk
-    from nltk.tree import Tree
     NLTK_AVAILABLE = True
 except ImportError:
     NLTK_AVAILABLE = False
@@ -24,13 +26,121 @@ except ImportError:
 from .config import ProcessingConfig, FinancialTerms
 
 
+# Word-bounded keyword patterns used by the pattern-based header detector,
+# fused into one alternation so each cell is scanned in a single pass. The
+# shared-strings pre-screen uses the same regex, so it rejects a workbook
+# only when keyword matching is the sole way a cell can become a header.
+_HEADER_KEYWORD_RE = re.compile(
+    r'\b(?:principal|interest|fee|rate|amount|balance|payment'
+    r'|current|outstanding|remaining|total'
+    r'|servicer|trustee|issuer|originator'
+    r'|pool|collateral|asset|security'
+    r'|distribution|collection|advance'
+    r'|delinquent|default|loss|recovery'
+    r'|enhancement|subordination|overcollateralization'
+    r'|waterfall|trigger|step|down'
+    r'|note|certificate|bond)\b'
+    r'|\b(?:class|tranche|series|tier)\s*[a-f]?\b',
+    re.IGNORECASE
+)
+
+# Shared strings table (xl/sharedStrings.xml) parsing for the workbook
+# pre-screen: each <si> item is one string, whose text is the concatenation
+# of its <t> elements (rich text splits a string into several runs)
+_SST_ITEM_RE = re.compile(r'<(?:\w+:)?si>(.*?)</(?:\w+:)?si>', re.DOTALL)
+_SST_TEXT_RE = re.compile(r'<(?:\w+:)?t(?:\s[^>]*)?>([^<]*)</(?:\w+:)?t>')
+# Cell types whose text is stored in the sheet XML rather than the SST
+_SHEET_STRING_CELL_RE = re.compile(rb'\st=["\'](?:inlineStr|str)["\']')
+
+
+# Cell text cleaning patterns, compiled once at import. Values and notes
+# embedded in a label are stripped in a single alternation pass; trailing
+# punctuation is handled afterwards since earlier removals can expose it.
+_GARBAGE_RE = re.compile(
+    r'\d+\.?\d*\s*%'                  # Percentages
+    r'|\$[\d,]+\.?\d*'                # Dollar amounts
+    r'|\b\d{1,2}/\d{1,2}/\d{2,4}\b'   # Dates
+    r'|\([^)]*\)'                     # Parenthetical notes
+    r'|^\{\d+\}\s*'                   # Leading {n} footnote markers
+)
+_TRAIL_PUNCT_RE = re.compile(r'[:\.,;]+$')
+_SEP_RE = re.compile(r'[_\-\s]+')
+_DIGIT_DEL = str.maketrans('', '', '0123456789')
+_WS_RE = re.compile(r'\s+')
+
+# Short tokens kept by the basic cleaner despite the minimum length rule
+_FINANCIAL_KEEPERS = frozenset({
+    'fee', 'tax', 'ytd', 'apr', 'apy', 'cpr', 'psa', 'a', 'b', 'c', 'd', 'e', 'f'
+})
+
+# Stopwords used when NLTK data is unavailable
+_BASIC_STOPWORDS = frozenset({
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you',
+    'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself',
+    'she', 'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them',
+    'their', 'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this',
+    'that', 'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing',
+    'an', 'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until',
+    'while', 'of', 'at', 'by', 'for', 'with', 'about', 'against', 'between',
+    'into', 'through', 'during', 'before', 'after', 'above', 'below', 'to',
+    'from', 'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again',
+    'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how',
+    'all', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such',
+    'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very'
+})
+
+
+@lru_cache(maxsize=1)
+def _english_stopwords() -> FrozenSet[str]:
+    """NLTK English stopword list, loaded from the corpus once per process"""
+    return frozenset(stopwords.words('english'))
+
+
+@lru_cache(maxsize=1)
+def _wordnet_lemmatizer() -> "WordNetLemmatizer":
+    """Shared WordNet lemmatizer (it holds no per-instance state)"""
+    return WordNetLemmatizer()
+
+
+@lru_cache(maxsize=131072)
+def _wordnet_lemma(token: str, wordnet_pos: str = 'n') -> str:
+    """WordNet lemma of a token, memoized across cells, files and extractors
+    
+    Report vocabulary is small and highly repetitive, so after the first few
+    files nearly every lookup is a cache hit instead of a morphy search.
+    """
+    return _wordnet_lemmatizer().lemmatize(token, wordnet_pos)
+
+
+def _combine_entity_patterns(patterns: List[Pattern]) -> Optional[Pattern]:
+    """Join entity patterns into one alternation used as a match prefilter
+    
+    A single search tells whether any pattern matches, so the common case
+    of a cell matching none of them costs one scan instead of one per
+    pattern. Patterns with groups are left out of the combination (their
+    numbering and backreferences would shift), in which case None is
+    returned and every pattern is searched individually.
+    """
+    if not patterns or any(pattern.groups for pattern in patterns):
+        return None
+    try:
+        return re.compile('|'.join(f'(?:{pattern.pattern})' for pattern in patterns), re.IGNORECASE)
+    except re.error:
+        return None
+
+
+# Class/tranche identifiers that earn a bonus in NLTK relevance scoring
+_CLASS_KEYWORDS = frozenset({'class', 'tranche', 'series', 'tier'})
+_CLASS_LETTERS = frozenset('abcdef')
+
+
 class NLTKDownloadManager:
     """Manage NLTK data downloads with offline support"""
     
     def __init__(self):
         self.required_data = [
-            'punkt', 'stopwords', 'wordnet', 'averaged_perceptron_tagger', 
-            'maxent_ne_chunker', 'words', 'omw-1.4'
+            'punkt', 'stopwords', 'wordnet', 'averaged_perceptron_tagger', 'omw-1.4'
         ]
         self.available_data = set()
         
@@ -46,12 +156,10 @@ class NLTKDownloadManager:
                     # Try to find existing data first
                     if data_name == 'punkt':
                         nltk.data.find('tokenizers/punkt')
-                    elif data_name in ['stopwords', 'wordnet', 'words', 'omw-1.4']:
+                    elif data_name in ['stopwords', 'wordnet', 'omw-1.4']:
                         nltk.data.find(f'corpora/{data_name}')
                     elif data_name == 'averaged_perceptron_tagger':
                         nltk.data.find('taggers/averaged_perceptron_tagger')
-                    elif data_name == 'maxent_ne_chunker':
-                        nltk.data.find('chunkers/maxent_ne_chunker')
                     
                     self.available_data.add(data_name)
                     
@@ -104,50 +212,47 @@ class EnhancedFinancialTermExtractor:
     def _initialize_nltk_components(self):
         """Initialize NLTK components with financial domain customization"""
         # Lemmatizer with custom exceptions
-        self.lemmatizer = WordNetLemmatizer()
-        
-        # Enhanced stopwords with financial domain awareness
-        base_stopwords = set(stopwords.words('english'))
-        
-        # Remove financial terms that should be preserved
-        self.stop_words = base_stopwords - self.nltk_config.financial_terms_to_preserve
+        self.lemmatizer = _wordnet_lemmatizer()
         
-        # Add domain-specific stopwords to remove
-        self.stop_words.update(self.nltk_config.financial_stopwords_to_remove)
+        # Enhanced stopwords with financial domain awareness: remove financial
+        # terms that should be preserved, add domain-specific noise words
+        self.stop_words = (
+            (_english_stopwords() - self.nltk_config.financial_terms_to_preserve)
+            | self.nltk_config.financial_stopwords_to_remove
+        )
         
         # Compile financial entity patterns for faster matching
         self.financial_entity_patterns = [
             re.compile(pattern, re.IGNORECASE) 
             for pattern in self.nltk_config.financial_entity_patterns
         ]
+        self._any_entity_pattern = _combine_entity_patterns(self.financial_entity_patterns)
         
         self.logger.info(f"Configured {len(self.stop_words)} stopwords, {len(self.financial_entity_patterns)} entity patterns")
     
     def _initialize_basic_components(self):
         """Initialize basic components without NLTK"""
         # Fallback to basic stopwords
-        self.stop_words = {
-            'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 
-            'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself',
-            'she', 'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them',
-            'their', 'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this',
-            'that', 'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been',
-            'being', 'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing',
-            'an', 'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until',
-            'while', 'of', 'at', 'by', 'for', 'with', 'about', 'against', 'between',
-            'into', 'through', 'during', 'before', 'after', 'above', 'below', 'to',
-            'from', 'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again',
-            'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how',
-            'all', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such',
-            'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very'
-        }
+        self.stop_words = _BASIC_STOPWORDS
         self.logger.warning("NLTK not available, using basic text processing")
         
-    def extract_headers_from_excel(self, file_path: Path) -> List[dict]:
-        """Extract header/label cells from Excel file with enhanced NLTK processing"""
+    def extract_headers_from_excel(self, file_path: Path) -> Tuple[Dict, List[dict]]:
+        """Extract header/label cells from Excel file with enhanced NLTK processing
+        
+        Returns:
+            Tuple of (file_stats, unique_headers). File statistics are returned
+            once per file rather than attached to every header dict; both are
+            empty when the file is skipped or cannot be read.
+        """
         try:
-            workbook = load_workbook(file_path, read_only=True)
+            if not self._shared_strings_have_financial_terms(file_path):
+                self.logger.info(f"Skipping {file_path.name}: no financial keywords in shared strings")
+                return {}, []
+            
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
             headers = []
+            seen_keys = set()
+            total_headers_found = 0
             file_stats = {
                 'file_path': str(file_path),
                 'file_name': file_path.name,
@@ -158,13 +263,16 @@ class EnhancedFinancialTermExtractor:
             for sheet_name in workbook.sheetnames:
                 try:
                     sheet = workbook[sheet_name]
-                    sheet_headers = self._extract_headers_from_sheet(sheet, sheet_name, file_path)
+                    sheet_headers, headers_found = self._extract_headers_from_sheet(
+                        sheet, sheet_name, file_path, seen_keys
+                    )
                     headers.extend(sheet_headers)
+                    total_headers_found += headers_found
                     
                     file_stats['sheets'][sheet_name] = {
                         'max_row': sheet.max_row,
                         'max_column': sheet.max_column,
-                        'headers_found': len(sheet_headers)
+                        'headers_found': headers_found
                     }
                     
                 except Exception as e:
@@ -173,77 +281,150 @@ class EnhancedFinancialTermExtractor:
             
             workbook.close()
             
-            # Calculate file totals
-            file_stats['total_max_rows'] = max([stats['max_row'] for stats in file_stats['sheets'].values()]) if file_stats['sheets'] else 0
-            file_stats['total_max_columns'] = max([stats['max_column'] for stats in file_stats['sheets'].values()]) if file_stats['sheets'] else 0
-            file_stats['total_headers_found'] = len(headers)
-            
-            # Enhanced deduplication with NLTK lemmatization
-            unique_headers = self._deduplicate_with_lemmatization(headers)
+            # Calculate file totals in one pass over the sheet stats; read-only
+            # sheets without a dimension record report None
+            total_max_rows = total_max_columns = 0
+            for stats in file_stats['sheets'].values():
+                total_max_rows = max(total_max_rows, stats['max_row'] or 0)
+                total_max_columns = max(total_max_columns, stats['max_column'] or 0)
+            file_stats['total_max_rows'] = total_max_rows
+            file_stats['total_max_columns'] = total_max_columns
+            file_stats['total_headers_found'] = total_headers_found
             
-            # Add file statistics to each header
-            for header_info in unique_headers:
-                header_info['file_stats'] = file_stats
-            
-            return unique_headers
+            return file_stats, headers
             
         except Exception as e:
             self.logger.error(f"Failed to extract headers from {file_path}: {e}")
-            return []
+            return {}, []
+    
+    def _shared_strings_have_financial_terms(self, file_path: Path) -> bool:
+        """Cheap pre-screen on the workbook's shared strings table
+        
+        Only applies when header acceptance is keyword-only: the header
+        keyword regex is run over the text of the SST strings, and a
+        workbook none of whose strings match cannot yield a header. With
+        NLTK relevance scoring enabled cells can be accepted without a
+        keyword, so nothing is screened. Workbooks without an SST (or not a
+        zip-based format), and workbooks with inline-string or string-formula
+        cells, whose text is not in the SST, also fall through to the full
+        load.
+        """
+        if self.nltk_ready and self.config.require_financial_context:
+            return True
+        
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                sst = archive.read('xl/sharedStrings.xml').decode('utf-8', 'ignore')
+                if any(
+                    _HEADER_KEYWORD_RE.search(''.join(_SST_TEXT_RE.findall(item)))
+                    for item in _SST_ITEM_RE.findall(sst)
+                ):
+                    return True
+                
+                # No keyword in the SST; the workbook can still have headers
+                # if a sheet keeps string cells of its own
+                return any(
+                    _SHEET_STRING_CELL_RE.search(archive.read(name))
+                    for name in archive.namelist()
+                    if name.startswith('xl/worksheets/') and name.endswith('.xml')
+                )
+        except (KeyError, zipfile.BadZipFile, OSError):
+            return True
     
-    def _extract_headers_from_sheet(self, sheet, sheet_name: str, file_path: Path) -> List[dict]:
-        """Extract headers from sheet with enhanced financial context detection"""
+    def _extract_headers_from_sheet(self, sheet, sheet_name: str, file_path: Path,
+                                    seen_keys: Set = None) -> Tuple[List[dict], int]:
+        """Extract headers from sheet with enhanced financial context detection
+        
+        Headers whose dedupe key is already in seen_keys are counted but not
+        returned, so repeats across a file's sheets never build a dict.
+        
+        Returns:
+            Tuple of (new unique headers, headers found including repeats)
+        """
         headers = []
-        max_rows = min(200, sheet.max_row)
+        headers_found = 0
+        if seen_keys is None:
+            seen_keys = set()
+        max_columns = self.config.max_header_scan_columns
+        consecutive_empty_rows = 0
         
-        for row_idx in range(1, max_rows + 1):
-            row = sheet[row_idx]
-            
-            for cell in row:
-                if self._is_enhanced_header_cell(cell):
-                    cleaned_text = self._enhanced_clean_financial_text(str(cell.value))
+        # Stream plain values; openpyxl fills in missing rows, so enumerate
+        # gives the true row number
+        rows = sheet.iter_rows(
+            min_row=1,
+            max_row=self.config.max_header_scan_rows,
+            max_col=max_columns,
+            values_only=True
+        )
+        for row_idx, row in enumerate(rows, start=1):
+            headers_before_row = headers_found
+            
+            for col_idx, value in enumerate(row[:max_columns], start=1):
+                # Only string cells can be headers; strip each one once
+                if not value or not isinstance(value, str):
+                    continue
+                text = value.strip()
+                if self._is_enhanced_header_text(text):
+                    cleaned_text = self._enhanced_clean_financial_text(text)
                     if cleaned_text and len(cleaned_text) > 2:
+                        headers_found += 1
+                        dedupe_key = self._dedupe_key(cleaned_text)
+                        if dedupe_key in seen_keys:
+                            continue
+                        seen_keys.add(dedupe_key)
+                        
+                        column_letter = get_column_letter(col_idx)
                         header_info = {
                             'term': cleaned_text,
-                            'original_text': str(cell.value),
+                            'original_text': value,
                             'file_path': str(file_path),
                             'file_name': file_path.name,
                             'sheet_name': sheet_name,
-                            'row': cell.row,
-                            'column': cell.column,
-                            'column_letter': cell.column_letter,
-                            'cell_address': f"{cell.column_letter}{cell.row}"
+                            'row': row_idx,
+                            'column': col_idx,
+                            'column_letter': column_letter,
+                            'cell_address': f"{column_letter}{row_idx}"
                         }
                         headers.append(header_info)
+            
+            # Header bands sit near the top of report sheets; stop once we
+            # are deep into data rows that yield nothing
+            if headers_found == headers_before_row:
+                consecutive_empty_rows += 1
+                if consecutive_empty_rows >= self.config.max_empty_header_rows:
+                    break
+            else:
+                consecutive_empty_rows = 0
         
-        return headers
+        return headers, headers_found
     
-    def _is_enhanced_header_cell(self, cell) -> bool:
-        """Enhanced header detection with configurable thresholds"""
-        if not cell.value or not isinstance(cell.value, str):
-            return False
-            
-        text = str(cell.value).strip()
+    def _is_enhanced_header_text(self, text: str) -> bool:
+        """Enhanced header detection with configurable thresholds
         
+        Expects the stripped text of a string cell; the caller filters out
+        non-string values.
+        """
         # Configurable length filtering
         if len(text) < self.config.min_term_length or len(text) > self.config.max_term_length:
             return False
             
         # Configurable numeric content filtering
-        number_ratio = len(re.findall(r'\d', text)) / len(text)
-        if number_ratio > self.config.numeric_content_threshold:
+        digit_count = len(text) - len(text.translate(_DIGIT_DEL))
+        if digit_count > self.config.numeric_content_threshold * len(text):
             return False
         
-        # Enhanced financial context detection
+        # Cheap single-regex keyword check first; a match accepts the cell
+        # without tokenizing and POS tagging it
+        if self._pattern_based_header_detection(text):
+            return True
+        
+        # Enhanced financial context detection for cells without a keyword hit
         if self.nltk_ready and self.config.require_financial_context:
             financial_score = self._calculate_financial_score_nltk(text)
-            if financial_score >= self.config.financial_context_threshold:
-                return True
-            elif financial_score >= self.nltk_config.financial_relevance_threshold:
-                return True
+            return financial_score >= min(self.config.financial_context_threshold,
+                                          self.nltk_config.financial_relevance_threshold)
         
-        # Fallback to pattern-based detection
-        return self._pattern_based_header_detection(text)
+        return False
     
     def _calculate_financial_score_nltk(self, text: str) -> float:
         """Enhanced financial relevance scoring with domain customization"""
@@ -258,11 +439,21 @@ class EnhancedFinancialTermExtractor:
             if total_tokens == 0:
                 return 0.0
             
-            # Enhanced financial keyword scoring
-            strong_matches = sum(1 for token, _ in pos_tags 
-                               if token in self.financial_terms.strong_financial_indicators)
-            weak_matches = sum(1 for token, _ in pos_tags 
-                             if token in self.financial_terms.weak_financial_indicators)
+            # Single pass over the tagged tokens for keyword, POS and class scoring
+            strong_indicators = self.financial_terms.strong_financial_indicators
+            weak_indicators = self.financial_terms.weak_financial_indicators
+            pos_weights = self.nltk_config.important_pos_tags if self.nltk_config.use_pos_tagging else {}
+            strong_matches = weak_matches = 0
+            pos_score = class_bonus = 0.0
+            
+            for token, pos in pos_tags:
+                strong_matches += token in strong_indicators
+                weak_matches += token in weak_indicators
+                pos_score += pos_weights.get(pos, 0.0)
+                if token in _CLASS_KEYWORDS:
+                    class_bonus += 0.4
+                elif token in _CLASS_LETTERS:  # Single letter class identifiers
+                    class_bonus += 0.3
             
             # Weighted scoring for financial indicators
             score += (strong_matches / total_tokens) * 0.8  # Strong indicators get high weight
@@ -270,56 +461,27 @@ class EnhancedFinancialTermExtractor:
             
             # POS tag-based scoring with domain priorities
             if self.nltk_config.use_pos_tagging:
-                pos_score = 0.0
-                for token, pos in pos_tags:
-                    if pos in self.nltk_config.important_pos_tags:
-                        pos_score += self.nltk_config.important_pos_tags[pos]
-                
                 score += (pos_score / total_tokens) * 0.3
             
-            # Enhanced class identifier detection
-            class_bonus = 0.0
-            for token, _ in pos_tags:
-                if token in ['class', 'tranche', 'series', 'tier']:
-                    class_bonus += 0.4
-                elif re.match(r'^[a-f]$', token):  # Single letter class identifiers
-                    class_bonus += 0.3
-            
             score += min(class_bonus, 0.6)  # Cap class bonus
             
             # Financial entity pattern matching
-            pattern_matches = sum(1 for pattern in self.financial_entity_patterns 
-                                if pattern.search(text))
+            # The combined pattern rules out most cells in one scan; the
+            # per-pattern count is only needed when something matches
+            if self._any_entity_pattern is None or self._any_entity_pattern.search(text):
+                pattern_matches = sum(1 for pattern in self.financial_entity_patterns 
+                                    if pattern.search(text))
+            else:
+                pattern_matches = 0
             if pattern_matches > 0:
                 score += min(pattern_matches * 0.2, 0.4)  # Cap pattern bonus
             
-            # Named Entity Recognition enhancement
-            if self.nltk_config.use_named_entity_recognition:
-                try:
-                    chunked = ne_chunk(pos_tags)
-                    financial_entities = self._extract_financial_entities(chunked)
-                    if financial_entities:
-                        score += min(len(financial_entities) * 0.15, 0.3)
-                except:
-                    pass
-            
             return min(score, 1.0)
             
         except Exception as e:
             self.logger.debug(f"Enhanced NLTK scoring failed for '{text}': {e}")
             return 0.0
     
-    def _extract_financial_entities(self, chunked_tokens) -> List[str]:
-        """Extract financial entities from NER-chunked tokens"""
-        entities = []
-        
-        for chunk in chunked_tokens:
-            if hasattr(chunk, 'label'):  # It's a named entity
-                entity_text = ' '.join([token for token, pos in chunk.leaves()])
-                entities.append(entity_text)
-        
-        return entities
-    
     def _enhanced_clean_financial_text(self, text: str) -> str:
         """Enhanced text cleaning with advanced NLTK customization"""
         if not text:
@@ -327,12 +489,8 @@ class EnhancedFinancialTermExtractor:
         
         # Basic cleaning (same as before)
         text = text.lower().strip()
-        text = re.sub(r'\d+\.?\d*\s*%', '', text)
-        text = re.sub(r'\$[\d,]+\.?\d*', '', text)
-        text = re.sub(r'\b\d{1,2}/\d{1,2}/\d{2,4}\b', '', text)
-        text = re.sub(r'\([^)]*\)', '', text)
-        text = re.sub(r'^\{\d+\}\s*', '', text)
-        text = re.sub(r'[:\.,;]+$', '', text)
+        text = _GARBAGE_RE.sub('', text)
+        text = _TRAIL_PUNCT_RE.sub('', text)
         
         if self.nltk_ready:
             return self._advanced_nltk_cleaning(text)
@@ -348,34 +506,23 @@ class EnhancedFinancialTermExtractor:
             # POS tagging for intelligent processing
             pos_tags = pos_tag(tokens) if self.nltk_config.use_pos_tagging else [(t, 'NN') for t in tokens]
             
-            # Advanced lemmatization with domain customization
-            cleaned_tokens = []
-            
-            for token, pos in pos_tags:
-                # Skip very short words except critical financial identifiers
-                if len(token) < self.config.min_term_length and token not in self.nltk_config.financial_terms_to_preserve:
-                    continue
-                
-                # Skip stopwords except preserved financial terms
-                if token in self.stop_words and token not in self.nltk_config.financial_terms_to_preserve:
-                    continue
-                
-                # Apply custom lemmatization
-                if self.nltk_config.use_lemmatization:
-                    lemmatized_token = self._custom_lemmatize(token, pos)
-                    cleaned_tokens.append(lemmatized_token)
-                else:
-                    cleaned_tokens.append(token)
+            # Phase 1: drop short words and stopwords, except preserved financial terms
+            preserve = self.nltk_config.financial_terms_to_preserve
+            min_length = self.config.min_term_length
+            stop_words = self.stop_words
+            kept = [
+                (token, pos) for token, pos in pos_tags
+                if token in preserve or (len(token) >= min_length and token not in stop_words)
+            ]
+            
+            # Phase 2: lemmatize only the survivors, with domain customization
+            if self.nltk_config.use_lemmatization:
+                cleaned_tokens = [self._custom_lemmatize(token, pos) for token, pos in kept]
+            else:
+                cleaned_tokens = [token for token, _ in kept]
             
             # Remove consecutive duplicates while preserving order
-            deduplicated = []
-            prev_token = None
-            for token in cleaned_tokens:
-                if token != prev_token:
-                    deduplicated.append(token)
-                prev_token = token
-            
-            return ' '.join(deduplicated)
+            return ' '.join(token for token, _ in groupby(cleaned_tokens))
             
         except Exception as e:
             self.logger.debug(f"Advanced NLTK cleaning failed: {e}")
@@ -395,94 +542,44 @@ class EnhancedFinancialTermExtractor:
         
         # Standard lemmatization with POS context
         wordnet_pos = self._get_wordnet_pos(pos)
-        return self.lemmatizer.lemmatize(token, wordnet_pos)
+        return _wordnet_lemma(token, wordnet_pos)
     
     def _basic_cleaning(self, text: str) -> str:
         """Basic text cleaning without NLTK"""
         # Normalize separators
-        text = re.sub(r'[_\-\s]+', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _SEP_RE.sub(' ', text)
+        text = _WS_RE.sub(' ', text).strip()
         
         # Simple tokenization
         words = text.split()
         
         # Remove stopwords and filter
-        financial_keepers = {'fee', 'tax', 'ytd', 'apr', 'apy', 'cpr', 'psa', 'a', 'b', 'c', 'd', 'e', 'f'}
-        cleaned_words = []
-        
-        for word in words:
-            if (len(word) > 2 or word in financial_keepers) and word not in self.stop_words:
-                cleaned_words.append(word)
+        stop_words = self.stop_words
+        cleaned_words = [
+            word for word in words
+            if (len(word) > 2 or word in _FINANCIAL_KEEPERS) and word not in stop_words
+        ]
         
         # Remove consecutive duplicates
-        deduplicated = []
-        prev_word = None
-        for word in cleaned_words:
-            if word != prev_word:
-                deduplicated.append(word)
-            prev_word = word
-        
-        return ' '.join(deduplicated)
+        return ' '.join(word for word, _ in groupby(cleaned_words))
     
-    def _deduplicate_with_lemmatization(self, headers: List[dict]) -> List[dict]:
-        """Smart deduplication using NLTK lemmatization"""
-        if not self.nltk_ready:
-            # Fallback to simple deduplication
-            seen_terms = {}
-            unique_headers = []
-            for header_info in headers:
-                term = header_info['term']
-                if term not in seen_terms:
-                    seen_terms[term] = True
-                    unique_headers.append(header_info)
-            return unique_headers
-        
-        # NLTK-enhanced deduplication
-        seen_lemmatized = {}
-        unique_headers = []
-        
-        for header_info in headers:
-            term = header_info['term']
-            
-            # Create lemmatized signature for comparison
-            try:
-                tokens = word_tokenize(term.lower())
-                lemmatized_tokens = [self.lemmatizer.lemmatize(token) for token in tokens]
-                lemmatized_signature = ' '.join(sorted(lemmatized_tokens))
-                
-                if lemmatized_signature not in seen_lemmatized:
-                    seen_lemmatized[lemmatized_signature] = True
-                    unique_headers.append(header_info)
-                    
-            except Exception as e:
-                # Fallback to exact matching
-                if term not in seen_lemmatized:
-                    seen_lemmatized[term] = True
-                    unique_headers.append(header_info)
+    def _dedupe_key(self, term: str):
+        """Key under which a cleaned term counts as a duplicate within a file
         
-        return unique_headers
+        With NLTK the key is the bag of lemmas, so inflection and word-order
+        variants collapse; a frozenset is order-independent and hashable.
+        Otherwise, or if tokenizing fails, the exact term is the key.
+        """
+        if not self.nltk_ready:
+            return term
+        try:
+            return frozenset(_wordnet_lemma(token) for token in word_tokenize(term.lower()))
+        except Exception:
+            return term
     
     def _pattern_based_header_detection(self, text: str) -> bool:
         """Pattern-based header detection fallback"""
-        # Financial term patterns
-        financial_patterns = [
-            r'\b(principal|interest|fee|rate|amount|balance|payment)\b',
-            r'\b(class|tranche|series|tier)\s*[a-f]?\b',
-            r'\b(current|outstanding|remaining|total)\b',
-            r'\b(servicer|trustee|issuer|originator)\b',
-            r'\b(pool|collateral|asset|security)\b',
-            r'\b(distribution|collection|advance)\b',
-            r'\b(delinquent|default|loss|recovery)\b',
-            r'\b(enhancement|subordination|overcollateralization)\b',
-            r'\b(waterfall|trigger|step|down)\b',
-            r'\b(note|certificate|bond|security)\b'
-        ]
-        
-        for pattern in financial_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-                
-        return False
+        return _HEADER_KEYWORD_RE.search(text) is not None
     
     def _get_wordnet_pos(self, treebank_pos: str) -> str:
         """Convert TreeBank POS tags to WordNet POS tags"""
@@ -0,0 +1,64 @@
+"""
+Input file discovery for Financial Pattern Discovery System
+
+Standard library only, so scripts can locate and validate their input
+files before the analysis stack (NLTK, scikit-learn, pandas) is loaded.
+"""
+
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+
+def iter_matching_files(directory: Path, pattern: str = "*.xlsx", recursive: bool = False,
+                        skip_dirs: Optional[Iterable[str]] = None) -> Iterator[Path]:
+    """Yield files in a directory whose names match a glob pattern
+    
+    Walks with os.scandir so entry names are matched before any Path is
+    built and entry types come from the directory listing instead of extra
+    stat calls. Directories are visited depth-first in listing order, the
+    same order Path.rglob uses; symlinked directories are not descended
+    into, and unreadable ones are skipped. Patterns containing a path
+    separator fall back to Path.glob.
+    
+    skip_dirs holds glob patterns for subdirectory names that are not
+    searched at all (e.g. ".*" for hidden directories, "__pycache__").
+    """
+    skip_patterns = tuple(skip_dirs or ())
+    
+    def skipped(name: str) -> bool:
+        return any(fnmatch(name, skip) for skip in skip_patterns)
+    
+    if '/' in pattern or os.sep in pattern:
+        matches = directory.rglob(pattern) if recursive else directory.glob(pattern)
+        if skip_patterns:
+            matches = (
+                match for match in matches
+                if not any(skipped(part) for part in match.relative_to(directory).parent.parts)
+            )
+        yield from matches
+        return
+    
+    pending = [os.fspath(directory)]
+    while pending:
+        # Like Path.rglob, silently skip directories that cannot be read
+        # (permissions) or that vanished during the walk
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        
+        subdirectories = []
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if is_dir:
+                    if recursive and not entry.is_symlink() and not skipped(entry.name):
+                        subdirectories.append(entry.path)
+                elif fnmatch(entry.name, pattern):
+                    yield Path(entry.path)
+        pending.extend(reversed(subdirectories))
@@ -3,14 +3,30 @@ Fuzzy matching module for Financial Pattern Discovery System
 """
 
 import logging
-from typing import Dict, List, Any
+from dataclasses import dataclass
+from typing import Dict, List, Any, FrozenSet, Optional
 import re
 
+import numpy as np
 from rapidfuzz import process, fuzz
 
 from .config import ProcessingConfig
 
 
+@dataclass(frozen=True)
+class ClusterMatchInfo:
+    """Per-cluster values used to score each term against the canonical name"""
+    __slots__ = ('canonical_lower', 'canonical_words', 'canonical_phrase',
+                 'class_letter', 'count', 'top_features')
+    
+    canonical_lower: str
+    canonical_words: FrozenSet[str]
+    canonical_phrase: str
+    class_letter: Optional[str]
+    count: int
+    top_features: FrozenSet[str]
+
+
 class FuzzyMatcher:
     """Fuzzy matching for financial terms"""
     
@@ -32,9 +48,13 @@ class FuzzyMatcher:
                 self.logger.info(f"Excluding cluster {cluster_id} with generic canonical name: '{canonical_name}'")
                 continue
             
+            # Canonical-name and cluster features are shared by every term
+            match_info = self._build_match_info(canonical_name, cluster_data)
+            self._score_cluster_terms(cluster_data['terms'], match_info.canonical_lower)
+            
             for term in cluster_data['terms']:
                 # Calculate confidence based on how well the term matches the canonical name
-                confidence_score = self._calculate_term_confidence(term, canonical_name, cluster_data)
+                confidence_score = self._calculate_term_confidence(term, canonical_name, cluster_data, match_info)
                 
                 # Only include mappings that meet the threshold
                 if confidence_score >= self.config.fuzzy_threshold:
@@ -54,43 +74,83 @@ class FuzzyMatcher:
         self.logger.info(f"Created {len(mappings)} mappings meeting {self.config.fuzzy_threshold}% threshold")
         return mappings
     
-    def _calculate_term_confidence(self, term: str, canonical_name: str, cluster_data: Dict[str, Any]) -> float:
-        """Calculate how well a term fits its canonical name"""
+    def _build_match_info(self, canonical_name: str, cluster_data: Dict[str, Any]) -> ClusterMatchInfo:
+        """Precompute the canonical-name and cluster features used for term confidence"""
+        class_letter = None
+        if 'class_' in canonical_name:
+            class_match = re.search(r'class_([a-f])', canonical_name)
+            if class_match:
+                class_letter = class_match.group(1)
+        
+        return ClusterMatchInfo(
+            canonical_lower=canonical_name.lower(),
+            canonical_words=frozenset(canonical_name.split('_')),
+            canonical_phrase=canonical_name.replace('_', ' '),
+            class_letter=class_letter,
+            count=cluster_data['count'],
+            top_features=frozenset(cluster_data.get('top_features', ()))
+        )
+    
+    def _score_cluster_terms(self, terms: List[str], canonical_lower: str):
+        """Batch-score a cluster's uncached terms against its canonical name
+        
+        One process.cdist call runs WRatio for the whole cluster in C across
+        threads; results land in match_cache for _calculate_term_confidence.
+        """
+        pending = [term_lower for term_lower in dict.fromkeys(term.lower() for term in terms)
+                   if (term_lower, canonical_lower) not in self.match_cache]
+        if not pending:
+            return
+        
+        scores = process.cdist(pending, [canonical_lower], scorer=fuzz.WRatio,
+                               dtype=np.float64, workers=-1)
+        for term_lower, score in zip(pending, scores[:, 0].tolist()):
+            self.match_cache[(term_lower, canonical_lower)] = score
+    
+    def _calculate_term_confidence(self, term: str, canonical_name: str, cluster_data: Dict[str, Any],
+                                   match_info: ClusterMatchInfo = None) -> float:
+        """Calculate how well a term fits its canonical name
+        
+        create_mappings passes match_info so per-cluster values are built once
+        rather than for every term.
+        """
+        if match_info is None:
+            match_info = self._build_match_info(canonical_name, cluster_data)
+        canonical_lower = match_info.canonical_lower
+        term_lower = term.lower()
         
-        # Direct fuzzy match between term and canonical name
-        direct_score = fuzz.WRatio(term.lower(), canonical_name.lower())
+        # Direct fuzzy match between term and canonical name, memoized since
+        # the same term/name pair recurs across clusters and runs
+        cache_key = (term_lower, canonical_lower)
+        direct_score = self.match_cache.get(cache_key)
+        if direct_score is None:
+            direct_score = fuzz.WRatio(term_lower, canonical_lower)
+            self.match_cache[cache_key] = direct_score
         
         # Boost score if term contains key words from canonical name
-        canonical_words = set(canonical_name.split('_'))
-        term_words = set(term.lower().split())
+        term_words = term_lower.split()
         
-        word_overlap = len(canonical_words.intersection(term_words))
+        word_overlap = len(match_info.canonical_words.intersection(term_words))
         if word_overlap > 0:
             overlap_bonus = min(20, word_overlap * 10)
             direct_score = min(100, direct_score + overlap_bonus)
         
         # Additional boost for exact substring matches
-        if canonical_name.replace('_', ' ') in term.lower():
+        if match_info.canonical_phrase in term_lower:
             direct_score = min(100, direct_score + 15)
         
         # Enhanced class-specific matching
-        if 'class_' in canonical_name:
-            # Extract class letter from canonical name
-            class_match = re.search(r'class_([a-f])', canonical_name)
-            if class_match:
-                class_letter = class_match.group(1)
-                # Check if term contains this class
-                if f'class {class_letter}' in term.lower() or f'class{class_letter}' in term.lower():
-                    direct_score = min(100, direct_score + 25)  # Significant boost for class match
+        class_letter = match_info.class_letter
+        if class_letter:
+            # Check if term contains this class
+            if f'class {class_letter}' in term_lower or f'class{class_letter}' in term_lower:
+                direct_score = min(100, direct_score + 25)  # Significant boost for class match
         
         # If the cluster is large and this term is representative, boost confidence
-        if cluster_data['count'] > 3:
+        if match_info.count > 3:
             # Check if this term appears in the top features
-            if 'top_features' in cluster_data:
-                term_words_in_features = any(word in cluster_data['top_features'] 
-                                           for word in term.lower().split())
-                if term_words_in_features:
-                    direct_score = min(100, direct_score + 10)
+            if not match_info.top_features.isdisjoint(term_words):
+                direct_score = min(100, direct_score + 10)
         
         return direct_score
     
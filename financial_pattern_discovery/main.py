@@ -2,14 +2,19 @@
 Main orchestrator module for Financial Pattern Discovery System
 """
 
+import os
 import time
 import logging
 import configparser
+from ast import literal_eval
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any
 from datetime import datetime
 
-import numpy as np
 from tqdm import tqdm
 
 from .config import ClusteringConfig, ProcessingConfig
@@ -18,19 +23,92 @@ from .clustering import FinancialTermClustering
 from .canonical import CanonicalNameGenerator
 from .fuzzy_matcher import FuzzyMatcher
 from .report_generator import ExcelReportGenerator
+from .files import iter_matching_files
+
+
+# Per-process extractor used by the extraction worker pool. Each worker
+# builds its own instance once instead of unpickling one per file.
+_worker_extractor = None
+
+
+def _init_extraction_worker(processing_config: ProcessingConfig):
+    """Create the extractor for this worker process
+    
+    The parent has already reported NLTK availability while building its
+    own extractor, so each worker's startup prints and warnings are muted.
+    """
+    global _worker_extractor
+    extractor_logger = logging.getLogger(FinancialTermExtractor.__module__)
+    level = extractor_logger.level
+    extractor_logger.setLevel(logging.ERROR)
+    try:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            _worker_extractor = FinancialTermExtractor(processing_config)
+    finally:
+        extractor_logger.setLevel(level)
+
+
+def _extract_headers_in_worker(file_path: Path):
+    """Extract headers from one file using the worker's extractor"""
+    return _worker_extractor.extract_headers_from_excel(file_path)
+
+
+def _bounded_jobs(executor, fn: Callable, items: List, window: int) -> Iterator[Callable]:
+    """Submit fn(item) to an executor with at most `window` jobs in flight
+    
+    Yields each job's result getter in input order; the next item is only
+    submitted once an earlier job has been handed out, so futures and
+    finished results never pile up for a whole directory at once.
+    """
+    pending = deque()
+    for item in items:
+        if len(pending) >= window:
+            yield pending.popleft().result
+        pending.append(executor.submit(fn, item))
+    while pending:
+        yield pending.popleft().result
+
+
+@lru_cache(maxsize=4)
+def _parse_config_file(path: str, mtime_ns: int, size: int) -> configparser.ConfigParser:
+    """Parse a config file, reused while its mtime and size are unchanged
+    
+    The parser is shared between callers, so it must only be read from.
+    """
+    config = configparser.ConfigParser()
+    config.read(path)
+    return config
+
+
+def _read_config_file(config_file) -> configparser.ConfigParser:
+    """Parsed contents of a config file (empty if it does not exist)"""
+    path = os.path.abspath(config_file)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        # ConfigParser.read skips missing files the same way
+        return configparser.ConfigParser()
+    return _parse_config_file(path, stat.st_mtime_ns, stat.st_size)
 
 
 class FinancialPatternDiscovery:
     """Main class orchestrating the financial pattern discovery process"""
     
-    def __init__(self, config_file: str = "config.ini"):
+    def __init__(self, config_file: str = "config.ini",
+                 clustering_config: Optional[ClusteringConfig] = None,
+                 processing_config: Optional[ProcessingConfig] = None):
         self.config_file = config_file
         self.clustering_config = None
         self.processing_config = None
         self.logger = self._setup_logging()
         
-        # Load configuration
+        # Load configuration; configs passed in take precedence over the
+        # file, and must be given here so every component is built with them
         self._load_configuration()
+        if clustering_config is not None:
+            self.clustering_config = clustering_config
+        if processing_config is not None:
+            self.processing_config = processing_config
         
         # Initialize components
         self.extractor = FinancialTermExtractor(self.processing_config)
@@ -54,8 +132,7 @@ class FinancialPatternDiscovery:
     def _load_configuration(self):
         """Load configuration from file or use defaults"""
         try:
-            config = configparser.ConfigParser()
-            config.read(self.config_file)
+            config = _read_config_file(self.config_file)
             
             # Clustering configuration
             if 'clustering' in config:
@@ -65,7 +142,7 @@ class FinancialPatternDiscovery:
                     max_features=int(clustering_section.get('max_features', 10000)),
                     min_df=int(clustering_section.get('min_df', 5)),
                     max_df=float(clustering_section.get('max_df', 0.5)),
-                    ngram_range=eval(clustering_section.get('ngram_range', '(1, 2)')),
+                    ngram_range=literal_eval(clustering_section.get('ngram_range', '(1, 2)')),
                     random_state=int(clustering_section.get('random_state', 42)),
                     use_hierarchical=clustering_section.get('use_hierarchical', 'false').lower() == 'true',
                     silhouette_threshold=float(clustering_section.get('silhouette_threshold', 0.3))
@@ -78,13 +155,15 @@ class FinancialPatternDiscovery:
                 processing_section = config['processing']
                 self.processing_config = ProcessingConfig(
                     chunk_size=int(processing_section.get('chunk_size', 10000)),
-                    max_workers=int(processing_section.get('max_workers', 4)),
+                    max_workers=int(processing_section.get('max_workers', 1)),
                     output_format=processing_section.get('output_format', 'xlsx'),
                     temp_dir=Path(processing_section.get('temp_dir', './temp')),
                     fuzzy_threshold=int(processing_section.get('fuzzy_threshold', 80)),
                     memory_threshold=float(processing_section.get('memory_threshold', 0.8)),
                     exclude_generic_canonicals=processing_section.get('exclude_generic_canonicals', 'true').lower() == 'true',
-                    exclude_low_priority_canonicals=processing_section.get('exclude_low_priority_canonicals', 'true').lower() == 'true'
+                    exclude_low_priority_canonicals=processing_section.get('exclude_low_priority_canonicals', 'true').lower() == 'true',
+                    max_empty_header_rows=int(processing_section.get('max_empty_header_rows', 50)),
+                    fast_writer=processing_section.get('fast_writer', 'false').lower() == 'true'
                 )
             else:
                 self.processing_config = ProcessingConfig()
@@ -95,7 +174,8 @@ class FinancialPatternDiscovery:
             self.processing_config = ProcessingConfig()
     
     def process_directory(self, directory_path: Path, pattern: str = "*.xlsx", 
-                         recursive: bool = False, output_path: Path = None) -> Dict[str, Any]:
+                         recursive: bool = False, output_path: Path = None,
+                         skip_dirs: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """Process all Excel files in a directory
         
         Args:
@@ -103,6 +183,7 @@ class FinancialPatternDiscovery:
             pattern: File pattern to match (default: *.xlsx)
             recursive: Whether to search subdirectories recursively
             output_path: Path for output report (optional)
+            skip_dirs: Glob patterns of subdirectory names not to search (optional)
             
         Returns:
             Dictionary containing processing results
@@ -114,10 +195,7 @@ class FinancialPatternDiscovery:
             raise ValueError(f"{directory_path} is not a directory")
         
         # Find Excel files
-        if recursive:
-            file_paths = list(directory_path.rglob(pattern))
-        else:
-            file_paths = list(directory_path.glob(pattern))
+        file_paths = list(iter_matching_files(directory_path, pattern, recursive, skip_dirs))
         
         if not file_paths:
             self.logger.warning(f"No files matching '{pattern}' found in {directory_path}")
@@ -147,38 +225,56 @@ class FinancialPatternDiscovery:
         file_term_mapping = {}
         file_statistics = {}  # New: collect file statistics
         
-        progress_bar = tqdm(file_paths, desc="Processing files")
-        
-        for file_path in progress_bar:
-            try:
-                term_info_list = self.extractor.extract_headers_from_excel(file_path)
-                if term_info_list:
-                    # Extract just the terms for clustering
-                    terms = [info['term'] for info in term_info_list]
-                    all_terms.extend(terms)
-                    all_term_info.extend(term_info_list)
-                    file_term_mapping[str(file_path)] = term_info_list
-                    
-                    # Collect file statistics from the first term info (all have same file_stats)
-                    if term_info_list and 'file_stats' in term_info_list[0]:
-                        file_statistics[str(file_path)] = term_info_list[0]['file_stats']
-                    
-                    progress_bar.set_postfix({"Terms extracted": len(terms)})
-                else:
-                    self.logger.warning(f"No terms extracted from {file_path.name}")
-                
-            except Exception as e:
-                self.logger.error(f"Failed to process {file_path}: {e}")
-                continue
+        # Files are independent, so extract them in a process pool when more
+        # than one worker is configured (max_workers defaults to 1, serial).
+        # Jobs are consumed in input order to keep results deterministic.
+        max_workers = min(self.processing_config.max_workers, len(file_paths))
+        executor = None
+        if max_workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_extraction_worker,
+                initargs=(self.processing_config,)
+            )
+            jobs = _bounded_jobs(executor, _extract_headers_in_worker, file_paths, 2 * max_workers)
+        else:
+            jobs = [partial(self.extractor.extract_headers_from_excel, file_path)
+                    for file_path in file_paths]
         
-        progress_bar.close()
+        progress_bar = tqdm(zip(file_paths, jobs), total=len(file_paths), desc="Processing files")
+        
+        try:
+            for file_path, job in progress_bar:
+                try:
+                    file_stats, term_info_list = job()
+                    if term_info_list:
+                        # Extract just the terms for clustering
+                        terms = [info['term'] for info in term_info_list]
+                        all_terms.extend(terms)
+                        all_term_info.extend(term_info_list)
+                        file_term_mapping[str(file_path)] = term_info_list
+                        file_statistics[str(file_path)] = file_stats
+                        
+                        progress_bar.set_postfix({"Terms extracted": len(terms)})
+                    else:
+                        self.logger.warning(f"No terms extracted from {file_path.name}")
+                    
+                except Exception as e:
+                    self.logger.error(f"Failed to process {file_path}: {e}")
+                    continue
+        finally:
+            progress_bar.close()
+            if executor is not None:
+                executor.shutdown()
         
         if not all_terms:
             self.logger.error("No terms extracted from any files")
             return {}
         
-        # Log extraction statistics
-        unique_terms = set(all_terms)
+        # Log extraction statistics. The same headers recur across reports,
+        # so downstream stages work on the order-preserving unique vocabulary;
+        # term_to_info maps results back to occurrence locations.
+        unique_terms = list(dict.fromkeys(all_terms))
         self.logger.info(f"Extracted {len(all_terms)} total terms ({len(unique_terms)} unique)")
         
         # Warn if very few unique terms
@@ -188,7 +284,7 @@ class FinancialPatternDiscovery:
         
         # Step 2: Cluster terms
         self.logger.info("Clustering financial terms...")
-        clustering_results = self.clusterer.cluster_terms(all_terms)
+        clustering_results = self.clusterer.cluster_terms(unique_terms)
         
         if not clustering_results['clusters']:
             self.logger.error("Clustering failed")
@@ -202,37 +298,40 @@ class FinancialPatternDiscovery:
         self.logger.info("Creating fuzzy mappings...")
         mappings = self.fuzzy_matcher.create_mappings(clustering_results['clusters'], canonical_names)
         
-        # Add detailed location information to mappings
+        # Add detailed location information to mappings, using the first
+        # occurrence of each term
+        term_to_info = {}
+        for term_info in all_term_info:
+            term_to_info.setdefault(term_info['term'], term_info)
+        
         for mapping in mappings:
-            original_term = mapping['original_term']
-            # Find the first occurrence of this term with location info
-            for term_info in all_term_info:
-                if term_info['term'] == original_term:
-                    mapping.update({
-                        'source_file': term_info['file_name'],
-                        'file_path': term_info['file_path'],
-                        'sheet_name': term_info['sheet_name'],
-                        'row': term_info['row'],
-                        'column': term_info['column'],
-                        'column_letter': term_info['column_letter'],
-                        'cell_address': term_info['cell_address'],
-                        'original_text': term_info['original_text']
-                    })
-                    break
+            term_info = term_to_info.get(mapping['original_term'])
+            if term_info:
+                mapping.update({
+                    'source_file': term_info['file_name'],
+                    'file_path': term_info['file_path'],
+                    'sheet_name': term_info['sheet_name'],
+                    'row': term_info['row'],
+                    'column': term_info['column'],
+                    'column_letter': term_info['column_letter'],
+                    'cell_address': term_info['cell_address'],
+                    'original_text': term_info['original_text']
+                })
         
         # Step 5: Compile results
         processing_time = time.time() - start_time
+        clusters = clustering_results['clusters']
         
         results = {
             'total_files': len(file_paths),
             'total_terms': len(all_terms),
-            'unique_terms': len(set(all_terms)),
-            'n_clusters': len(clustering_results['clusters']),
-            'avg_cluster_size': np.mean([cluster['count'] for cluster in clustering_results['clusters'].values()]),
+            'unique_terms': len(unique_terms),
+            'n_clusters': len(clusters),
+            'avg_cluster_size': sum(cluster['count'] for cluster in clusters.values()) / len(clusters),
             'silhouette_score': clustering_results['metrics'].get('silhouette_score', 0),
             'high_confidence_count': len([m for m in mappings if m['confidence'] in ['high', 'very_high']]),
             'processing_time': processing_time,
-            'clusters': clustering_results['clusters'],
+            'clusters': clusters,
             'canonical_names': canonical_names,
             'mappings': mappings,
             'file_term_mapping': file_term_mapping,
@@ -266,7 +365,7 @@ class FinancialPatternDiscovery:
         
         config['processing'] = {
             'chunk_size': '10000',
-            'max_workers': '4',
+            'max_workers': '1',
             'output_format': 'xlsx',
             'temp_dir': './temp',
             'fuzzy_threshold': '80',
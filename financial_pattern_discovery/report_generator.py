@@ -3,52 +3,190 @@ Excel report generation module for Financial Pattern Discovery System
 """
 
 import logging
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, NamedTuple, Tuple
 from datetime import datetime
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
+# Optional fast writer (xlsxwriter) for large reports
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
 from .config import ProcessingConfig
 
 
+class StyledRow(NamedTuple):
+    """A header or section title row; plain data rows are lists"""
+    style: str  # 'header' or 'title'
+    values: List[Any]
+
+
 class ExcelReportGenerator:
     """Generate comprehensive Excel reports"""
     
+    # Shared openpyxl styles; cells copy them on assignment, so one
+    # instance serves every header and title cell
+    _HEADER_FONT = Font(bold=True)
+    _HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    _TITLE_FONT = Font(bold=True, size=14)
+    
+    # Excel rejects or silently cuts cell text beyond this many characters
+    _CELL_CHAR_LIMIT = 32767
+    
     def __init__(self, config: ProcessingConfig):
         self.config = config
         self.logger = logging.getLogger(__name__)
         
     def generate_report(self, results: Dict[str, Any], output_path: Path):
-        """Generate comprehensive Excel report"""
-        workbook = Workbook()
+        """Generate comprehensive Excel report
         
-        # Remove default sheet
-        workbook.remove(workbook.active)
+        Sheet contents are built as plain rows first, then written with
+        xlsxwriter when config.fast_writer is set and it is installed, or
+        with openpyxl in write-only mode otherwise.
+        """
+        sheets = [("Summary", *self._create_summary_sheet(results), 50)]
         
-        # Create sheets
-        self._create_summary_sheet(workbook, results)
-        self._create_file_statistics_sheet(workbook, results)  # New tab
-        self._create_cluster_details_sheet(workbook, results)
-        self._create_mappings_sheet(workbook, results)
-        self._create_statistics_sheet(workbook, results)
+        # Data sheets are only written when their section has content
+        if results.get('file_statistics'):
+            sheets.append(("File Statistics", *self._create_file_statistics_sheet(results), 30))
+        if results.get('clusters'):
+            sheets.append(("Cluster Details", *self._create_cluster_details_sheet(results), 100))
+        if results.get('mappings'):
+            sheets.append(("Term Mappings", *self._create_mappings_sheet(results), 50))
+        if results.get('clusters'):
+            sheets.append(("Statistics", *self._create_statistics_sheet(results), 50))
+        
+        if self.config.fast_writer and XLSXWRITER_AVAILABLE:
+            self._save_with_xlsxwriter(sheets, output_path)
+        else:
+            if self.config.fast_writer:
+                self.logger.warning("xlsxwriter not installed, falling back to openpyxl writer")
+            self._save_with_openpyxl(sheets, output_path)
         
-        # Save workbook
-        workbook.save(output_path)
         self.logger.info(f"Report saved to {output_path}")
     
-    def _create_summary_sheet(self, workbook: Workbook, results: Dict[str, Any]):
+    def _save_with_openpyxl(self, sheets: List[tuple], output_path: Path):
+        """Write sheets with openpyxl in write-only mode
+        
+        Rows stream to disk instead of being held as cell objects. Write-only
+        sheets cannot be re-read, so column widths are set before the first
+        append; write-only workbooks also start without a default sheet.
+        """
+        workbook = Workbook(write_only=True)
+        
+        for name, rows, max_lengths, max_width in sheets:
+            ws = workbook.create_sheet(name)
+            for col, max_length in enumerate(max_lengths, 1):
+                ws.column_dimensions[get_column_letter(col)].width = min(max_length + 2, max_width)
+            freeze_row = self._header_freeze_row(rows)
+            if freeze_row:
+                ws.freeze_panes = f"A{freeze_row + 1}"
+            
+            for row in rows:
+                if isinstance(row, StyledRow):
+                    row = [self._styled_cell(ws, value, row.style) for value in row.values]
+                ws.append(row)
+        
+        workbook.save(output_path)
+    
+    def _styled_cell(self, ws, value: Any, style: str) -> WriteOnlyCell:
+        """Build a header or title cell for a write-only sheet"""
+        cell = WriteOnlyCell(ws, value=value)
+        if style == 'title':
+            cell.font = self._TITLE_FONT
+        else:
+            cell.font = self._HEADER_FONT
+            cell.fill = self._HEADER_FILL
+        return cell
+    
+    def _save_with_xlsxwriter(self, sheets: List[tuple], output_path: Path):
+        """Write sheets with xlsxwriter in constant-memory mode
+        
+        Each row is flushed as soon as it is written. String conversion
+        options are disabled so cell text is stored exactly as openpyxl
+        would store it.
+        """
+        options = {
+            'constant_memory': True,
+            'strings_to_numbers': False,
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+        }
+        with xlsxwriter.Workbook(str(output_path), options) as workbook:
+            formats = {
+                'header': workbook.add_format({'bold': True, 'bg_color': '#366092', 'pattern': 1}),
+                'title': workbook.add_format({'bold': True, 'font_size': 14}),
+            }
+            
+            for name, rows, max_lengths, max_width in sheets:
+                ws = workbook.add_worksheet(name)
+                for col, max_length in enumerate(max_lengths):
+                    ws.set_column(col, col, min(max_length + 2, max_width))
+                freeze_row = self._header_freeze_row(rows)
+                if freeze_row:
+                    ws.freeze_panes(freeze_row, 0)
+                
+                for row_idx, row in enumerate(rows):
+                    if isinstance(row, StyledRow):
+                        ws.write_row(row_idx, 0, row.values, formats[row.style])
+                    elif row:
+                        ws.write_row(row_idx, 0, row)
+    
+    def _header_freeze_row(self, rows: list) -> int:
+        """Number of leading rows to freeze so the header stays visible
+        
+        Only sheets with a single header row are frozen; a sheet holding
+        several tables (File Statistics) scrolls freely. Returns 0 when
+        nothing should be frozen.
+        """
+        header_rows = [
+            row_idx for row_idx, row in enumerate(rows)
+            if isinstance(row, StyledRow) and row.style == 'header'
+        ]
+        return header_rows[0] + 1 if len(header_rows) == 1 else 0
+    
+    def _join_for_cell(self, items: List[str]) -> str:
+        """Comma-join items, truncating to fit Excel's per-cell text limit
+        
+        Oversized lists keep as many whole items as fit and end with a
+        "…(+N more)" marker for the rest.
+        """
+        text = ', '.join(items)
+        if len(text) <= self._CELL_CHAR_LIMIT:
+            return text
+        
+        budget = self._CELL_CHAR_LIMIT - 32  # room for the marker
+        length = 0
+        for shown, item in enumerate(items):
+            length += len(item) + 2
+            if length > budget:
+                break
+        return f"{', '.join(items[:shown])} …(+{len(items) - shown} more)"
+    
+    def _track_widths(self, max_lengths: List[int], values: list):
+        """Widen the tracked column lengths to fit a row of plain values"""
+        for col, value in enumerate(values):
+            length = len(str(value))
+            if length > max_lengths[col]:
+                max_lengths[col] = length
+    
+    def _create_summary_sheet(self, results: Dict[str, Any]) -> Tuple[List[list], List[int]]:
         """Create summary sheet with key metrics"""
-        ws = workbook.create_sheet("Summary")
         
         # Headers
         headers = ['Metric', 'Value', 'Description']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        max_lengths = [len(header) for header in headers]
+        rows = [StyledRow('header', headers)]
         
         # Data rows
         metrics = [
@@ -60,232 +198,161 @@ class ExcelReportGenerator:
             ('High Confidence Mappings', results.get('high_confidence_count', 0), 'Mappings with high confidence'),
             ('Processing Time', results.get('processing_time', 0), 'Total processing time (seconds)')
         ]
+        for metric in metrics:
+            row = list(metric)
+            self._track_widths(max_lengths, row)
+            rows.append(row)
         
-        for row, (metric, value, desc) in enumerate(metrics, 2):
-            ws.cell(row=row, column=1, value=metric)
-            ws.cell(row=row, column=2, value=value)
-            ws.cell(row=row, column=3, value=desc)
-        
-        # Auto-adjust columns
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        return rows, max_lengths
     
-    def _create_file_statistics_sheet(self, workbook: Workbook, results: Dict[str, Any]):
+    def _create_file_statistics_sheet(self, results: Dict[str, Any]) -> Tuple[List[list], List[int]]:
         """Create file statistics sheet showing rows/columns per input file"""
-        ws = workbook.create_sheet("File Statistics")
+        
+        file_headers = ['File Name', 'Total Sheets', 'Max Rows', 'Max Columns', 'Headers Found']
+        sheet_headers = ['File Name', 'Sheet Name', 'Rows', 'Columns', 'Headers Found']
+        max_lengths = [len(header) for header in file_headers]
+        self._track_widths(max_lengths, sheet_headers)
+        self._track_widths(max_lengths, ["File Summary"])
+        self._track_widths(max_lengths, ["Sheet Details"])
+        
+        file_statistics = results.get('file_statistics', {})
         
         # File-level summary first
-        ws.cell(row=1, column=1, value="File Summary").font = Font(bold=True, size=14)
+        rows = [StyledRow('title', ["File Summary"]), []]
         
         # File summary headers
-        file_headers = ['File Name', 'Total Sheets', 'Max Rows', 'Max Columns', 'Headers Found']
-        for col, header in enumerate(file_headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        rows.append(StyledRow('header', file_headers))
         
         # File summary data
-        row = 4
-        for file_path, file_stats in results.get('file_statistics', {}).items():
-            file_name = Path(file_path).name
-            ws.cell(row=row, column=1, value=file_name)
-            ws.cell(row=row, column=2, value=file_stats.get('total_sheets', 0))
-            ws.cell(row=row, column=3, value=file_stats.get('total_max_rows', 0))
-            ws.cell(row=row, column=4, value=file_stats.get('total_max_columns', 0))
-            ws.cell(row=row, column=5, value=file_stats.get('total_headers_found', 0))
-            row += 1
+        for file_path, file_stats in file_statistics.items():
+            row = [
+                Path(file_path).name,
+                file_stats.get('total_sheets', 0),
+                file_stats.get('total_max_rows', 0),
+                file_stats.get('total_max_columns', 0),
+                file_stats.get('total_headers_found', 0)
+            ]
+            self._track_widths(max_lengths, row)
+            rows.append(row)
         
         # Add some spacing
-        row += 2
+        rows.extend([[], []])
         
         # Sheet-level details
-        ws.cell(row=row, column=1, value="Sheet Details").font = Font(bold=True, size=14)
-        row += 2
+        rows.extend([StyledRow('title', ["Sheet Details"]), []])
         
         # Sheet detail headers
-        sheet_headers = ['File Name', 'Sheet Name', 'Rows', 'Columns', 'Headers Found']
-        for col, header in enumerate(sheet_headers, 1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        
-        row += 1
+        rows.append(StyledRow('header', sheet_headers))
         
         # Sheet detail data
-        for file_path, file_stats in results.get('file_statistics', {}).items():
+        for file_path, file_stats in file_statistics.items():
             file_name = Path(file_path).name
             for sheet_name, sheet_stats in file_stats.get('sheets', {}).items():
-                ws.cell(row=row, column=1, value=file_name)
-                ws.cell(row=row, column=2, value=sheet_name)
-                ws.cell(row=row, column=3, value=sheet_stats.get('max_row', 0))
-                ws.cell(row=row, column=4, value=sheet_stats.get('max_column', 0))
-                ws.cell(row=row, column=5, value=sheet_stats.get('headers_found', 0))
-                row += 1
-        
-        # Auto-adjust columns
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            adjusted_width = min(max_length + 2, 30)
-            ws.column_dimensions[column_letter].width = adjusted_width
+                row = [
+                    file_name,
+                    sheet_name,
+                    sheet_stats.get('max_row', 0),
+                    sheet_stats.get('max_column', 0),
+                    sheet_stats.get('headers_found', 0)
+                ]
+                self._track_widths(max_lengths, row)
+                rows.append(row)
+        
+        return rows, max_lengths
     
-    def _create_cluster_details_sheet(self, workbook: Workbook, results: Dict[str, Any]):
+    def _create_cluster_details_sheet(self, results: Dict[str, Any]) -> Tuple[List[list], List[int]]:
         """Create detailed cluster information sheet"""
-        ws = workbook.create_sheet("Cluster Details")
         
         # Headers
         headers = ['Cluster ID', 'Canonical Name', 'Term Count', 'Terms', 'Top Features']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        max_lengths = [len(header) for header in headers]
+        rows = [StyledRow('header', headers)]
         
         # Data rows
-        row = 2
-        for cluster_id, cluster_data in results.get('clusters', {}).items():
-            canonical_name = results.get('canonical_names', {}).get(cluster_id, 'unknown')
-            
-            ws.cell(row=row, column=1, value=cluster_id)
-            ws.cell(row=row, column=2, value=canonical_name)
-            ws.cell(row=row, column=3, value=cluster_data['count'])
-            ws.cell(row=row, column=4, value=', '.join(cluster_data['terms']))
-            ws.cell(row=row, column=5, value=', '.join(cluster_data.get('top_features', [])))
-            
-            row += 1
+        clusters = results.get('clusters', {})
+        canonical_names = results.get('canonical_names', {})
+        for cluster_id, cluster_data in clusters.items():
+            canonical_name = canonical_names.get(cluster_id, 'unknown')
+            row = [
+                cluster_id,
+                canonical_name,
+                cluster_data['count'],
+                self._join_for_cell(cluster_data['terms']),
+                self._join_for_cell(cluster_data.get('top_features', []))
+            ]
+            self._track_widths(max_lengths, row)
+            rows.append(row)
         
-        # Auto-adjust columns
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            adjusted_width = min(max_length + 2, 100)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        return rows, max_lengths
     
-    def _create_mappings_sheet(self, workbook: Workbook, results: Dict[str, Any]):
+    def _create_mappings_sheet(self, results: Dict[str, Any]) -> Tuple[List[list], List[int]]:
         """Create term mappings sheet"""
-        ws = workbook.create_sheet("Term Mappings")
         
         # Headers - Added location information columns
         headers = [
             'Original Term', 'Canonical Name', 'Cluster ID', 'Fuzzy Score', 'Confidence', 
             'Source File', 'Sheet Name', 'Cell Address', 'Row', 'Column', 'Original Text'
         ]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        max_lengths = [len(header) for header in headers]
+        rows = [StyledRow('header', headers)]
         
         # Data rows - Sort by fuzzy score descending
         mappings = results.get('mappings', [])
-        # Sort mappings by fuzzy_score in descending order (highest confidence first)
-        sorted_mappings = sorted(mappings, key=lambda x: x.get('fuzzy_score', 0), reverse=True)
-        
-        for row, mapping in enumerate(sorted_mappings, 2):
-            ws.cell(row=row, column=1, value=mapping['original_term'])
-            ws.cell(row=row, column=2, value=mapping['canonical_name'])
-            ws.cell(row=row, column=3, value=mapping['cluster_id'])
-            ws.cell(row=row, column=4, value=mapping['fuzzy_score'])
-            ws.cell(row=row, column=5, value=mapping['confidence'])
-            ws.cell(row=row, column=6, value=mapping.get('source_file', 'unknown'))
-            ws.cell(row=row, column=7, value=mapping.get('sheet_name', 'unknown'))
-            ws.cell(row=row, column=8, value=mapping.get('cell_address', 'unknown'))
-            ws.cell(row=row, column=9, value=mapping.get('row', 'unknown'))
-            ws.cell(row=row, column=10, value=mapping.get('column', 'unknown'))
-            ws.cell(row=row, column=11, value=mapping.get('original_text', 'unknown'))
-
-        # Auto-adjust columns
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        # Sort mappings by fuzzy_score in descending order (highest confidence first);
+        # fill in the default once so the sort key can be a C-level itemgetter
+        for mapping in mappings:
+            mapping.setdefault('fuzzy_score', 0)
+        sorted_mappings = sorted(mappings, key=itemgetter('fuzzy_score'), reverse=True)
+        
+        for mapping in sorted_mappings:
+            row = [
+                mapping['original_term'],
+                mapping['canonical_name'],
+                mapping['cluster_id'],
+                mapping['fuzzy_score'],
+                mapping['confidence'],
+                mapping.get('source_file', 'unknown'),
+                mapping.get('sheet_name', 'unknown'),
+                mapping.get('cell_address', 'unknown'),
+                mapping.get('row', 'unknown'),
+                mapping.get('column', 'unknown'),
+                mapping.get('original_text', 'unknown')
+            ]
+            self._track_widths(max_lengths, row)
+            rows.append(row)
+        
+        return rows, max_lengths
     
-    def _create_statistics_sheet(self, workbook: Workbook, results: Dict[str, Any]):
+    def _create_statistics_sheet(self, results: Dict[str, Any]) -> Tuple[List[list], List[int]]:
         """Create statistics and frequency analysis sheet"""
-        ws = workbook.create_sheet("Statistics")
         
         # Term frequency analysis
-        ws.cell(row=1, column=1, value="Term Frequency Analysis").font = Font(bold=True, size=14)
-        
         headers = ['Term', 'Frequency', 'Percentage', 'Cluster ID']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        max_lengths = [len(header) for header in headers]
+        self._track_widths(max_lengths, ["Term Frequency Analysis"])
+        rows = [StyledRow('title', ["Term Frequency Analysis"]), []]
+        rows.append(StyledRow('header', headers))
         
-        # Calculate term frequencies
-        term_freq = {}
-        total_terms = 0
+        # Calculate term frequencies in C; most_common() sorts by count with
+        # ties kept in first-seen order
+        clusters = results.get('clusters', {})
+        term_freq = Counter(chain.from_iterable(cluster_data['terms'] for cluster_data in clusters.values()))
+        total_terms = sum(term_freq.values())
+        sorted_terms = term_freq.most_common()
         
-        for cluster_id, cluster_data in results.get('clusters', {}).items():
-            for term in cluster_data['terms']:
-                term_freq[term] = term_freq.get(term, 0) + 1
-                total_terms += 1
-        
-        # Sort by frequency
-        sorted_terms = sorted(term_freq.items(), key=lambda x: x[1], reverse=True)
+        # First cluster each term appears in; walking clusters in reverse
+        # lets the earliest one win
+        term_to_cluster = {
+            term: cluster_id
+            for cluster_id, cluster_data in reversed(list(clusters.items()))
+            for term in cluster_data['terms']
+        }
         
         # Add data rows
-        for row, (term, freq) in enumerate(sorted_terms, 4):
+        for term, freq in sorted_terms:
             percentage = (freq / total_terms * 100) if total_terms > 0 else 0
-            
-            # Find cluster ID for this term
-            cluster_id = None
-            for cid, cluster_data in results.get('clusters', {}).items():
-                if term in cluster_data['terms']:
-                    cluster_id = cid
-                    break
-            
-            ws.cell(row=row, column=1, value=term)
-            ws.cell(row=row, column=2, value=freq)
-            ws.cell(row=row, column=3, value=f"{percentage:.1f}%")
-            ws.cell(row=row, column=4, value=cluster_id)
-        
-        # Auto-adjust columns
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
\ No newline at end of file
+            row = [term, freq, f"{percentage:.1f}%", term_to_cluster.get(term)]
+            self._track_widths(max_lengths, row)
+            rows.append(row)
+        
+        return rows, max_lengths
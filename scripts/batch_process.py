@@ -3,11 +3,23 @@
 Batch processing example for multiple directories with different configurations
 """
 
+import os
+import re
+import sqlite3
 import sys
 from pathlib import Path
 import json
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
+# Optional fast JSON (orjson); stdlib json is the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from financial_pattern_discovery import (
@@ -17,6 +29,62 @@ from financial_pattern_discovery import (
 )
 
 
+def _write_json(path: Path, payload):
+    """Write payload as indented JSON, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=2)
+
+
+def _read_json(path: Path):
+    """Read a JSON file, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _run_servicer(servicer: str, config: dict) -> dict:
+    """Run discovery for one servicer directory
+    
+    Module-level so it can be pickled into a worker process. Errors are
+    caught here and reported back so one servicer cannot fail the pool.
+    """
+    try:
+        # Create custom configuration
+        clustering_config = ClusteringConfig(
+            n_clusters=config['clustering'].get('n_clusters', 8),
+            min_df=config['clustering'].get('min_df', 5)
+        )
+        
+        # Servicers already run one per worker process, so extract serially
+        # inside each rather than nesting another process pool
+        processing_config = ProcessingConfig(
+            fuzzy_threshold=config['clustering'].get('fuzzy_threshold', 80),
+            max_workers=1
+        )
+        
+        # Initialize discovery system
+        discoverer = FinancialPatternDiscovery(
+            clustering_config=clustering_config,
+            processing_config=processing_config
+        )
+        
+        # Process directory
+        results = discoverer.process_directory(
+            directory_path=Path(config['directory']),
+            pattern=config['pattern'],
+            recursive=True,
+            output_path=Path(f"patterns_{servicer}_{datetime.now().strftime('%Y%m%d')}.xlsx")
+        )
+        return {'results': results, 'error': None}
+        
+    except Exception as e:
+        return {'results': None, 'error': str(e)}
+
+
 def batch_process_servicers():
     """Process multiple servicer directories with custom configurations"""
     
@@ -57,89 +125,89 @@ def batch_process_servicers():
     
     print("🚀 Starting batch processing of servicer directories\n")
     
-    for servicer, config in servicer_configs.items():
-        print(f"📊 Processing {servicer.upper()}...")
-        
-        try:
-            # Create custom configuration
-            clustering_config = ClusteringConfig(
-                n_clusters=config['clustering'].get('n_clusters', 8),
-                min_df=config['clustering'].get('min_df', 5)
-            )
-            
-            processing_config = ProcessingConfig(
-                fuzzy_threshold=config['clustering'].get('fuzzy_threshold', 80)
-            )
-            
-            # Initialize discovery system
-            discoverer = FinancialPatternDiscovery()
-            discoverer.clustering_config = clustering_config
-            discoverer.processing_config = processing_config
-            
-            # Process directory
-            results = discoverer.process_directory(
-                directory_path=Path(config['directory']),
-                pattern=config['pattern'],
-                recursive=True,
-                output_path=Path(f"patterns_{servicer}_{datetime.now().strftime('%Y%m%d')}.xlsx")
-            )
-            
-            # Store results
-            all_results[servicer] = results
+    # Servicers have separate inputs and outputs, so run them in parallel.
+    # Discovery logs its own progress; the status lines are collected and
+    # written once after the pool finishes.
+    outcomes = {}
+    status_lines = []
+    max_workers = min(len(servicer_configs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_run_servicer, servicer, config): servicer
+            for servicer, config in servicer_configs.items()
+        }
+        for future in as_completed(futures):
+            servicer = futures[future]
+            outcome = future.result()
+            outcomes[servicer] = outcome
             
-            # Collect summary stats
-            if results:
-                summary_stats.append({
-                    'servicer': servicer,
-                    'files_processed': results['total_files'],
-                    'terms_extracted': results['total_terms'],
-                    'clusters_found': results['n_clusters'],
-                    'high_confidence': results['high_confidence_count'],
-                    'processing_time': results['processing_time']
-                })
-                
-                print(f"  ✅ Completed: {results['total_files']} files, {results['n_clusters']} clusters\n")
+            results = outcome['results']
+            if outcome['error']:
+                status_lines.append(f"❌ Error processing {servicer}: {outcome['error']}")
+            elif results:
+                status_lines.append(f"✅ {servicer.upper()} completed: {results['total_files']} files, {results['n_clusters']} clusters")
             else:
-                print(f"  ⚠️  No files found or processing failed\n")
-                
-        except Exception as e:
-            print(f"  ❌ Error processing {servicer}: {e}\n")
+                status_lines.append(f"⚠️  {servicer.upper()}: no files found or processing failed")
+    print("\n".join(status_lines))
+    
+    # Collect results in configuration order so the summary is stable
+    for servicer in servicer_configs:
+        outcome = outcomes[servicer]
+        if outcome['error']:
             continue
+        
+        # Store results
+        results = outcome['results']
+        all_results[servicer] = results
+        
+        # Collect summary stats
+        if results:
+            summary_stats.append({
+                'servicer': servicer,
+                'files_processed': results['total_files'],
+                'terms_extracted': results['total_terms'],
+                'clusters_found': results['n_clusters'],
+                'high_confidence': results['high_confidence_count'],
+                'processing_time': results['processing_time']
+            })
     
     # Generate combined summary report
-    print("\n📈 BATCH PROCESSING SUMMARY")
-    print("=" * 50)
-    
     total_files = sum(s['files_processed'] for s in summary_stats)
     total_terms = sum(s['terms_extracted'] for s in summary_stats)
     total_time = sum(s['processing_time'] for s in summary_stats)
     
-    print(f"Total servicers processed: {len(summary_stats)}")
-    print(f"Total files processed: {total_files}")
-    print(f"Total terms extracted: {total_terms}")
-    print(f"Total processing time: {total_time:.2f} seconds")
-    
-    print("\nPer-servicer breakdown:")
+    # Build the whole block and write it once rather than line by line
+    summary_lines = [
+        "\n📈 BATCH PROCESSING SUMMARY",
+        "=" * 50,
+        f"Total servicers processed: {len(summary_stats)}",
+        f"Total files processed: {total_files}",
+        f"Total terms extracted: {total_terms}",
+        f"Total processing time: {total_time:.2f} seconds",
+        "\nPer-servicer breakdown:",
+    ]
     for stat in summary_stats:
-        print(f"\n{stat['servicer'].upper()}:")
-        print(f"  Files: {stat['files_processed']}")
-        print(f"  Terms: {stat['terms_extracted']}")
-        print(f"  Clusters: {stat['clusters_found']}")
-        print(f"  High confidence: {stat['high_confidence']}")
+        summary_lines.extend([
+            f"\n{stat['servicer'].upper()}:",
+            f"  Files: {stat['files_processed']}",
+            f"  Terms: {stat['terms_extracted']}",
+            f"  Clusters: {stat['clusters_found']}",
+            f"  High confidence: {stat['high_confidence']}",
+        ])
+    print("\n".join(summary_lines))
     
     # Save summary to JSON
     summary_file = f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(summary_file, 'w') as f:
-        json.dump({
-            'timestamp': datetime.now().isoformat(),
-            'summary_stats': summary_stats,
-            'totals': {
-                'servicers': len(summary_stats),
-                'files': total_files,
-                'terms': total_terms,
-                'processing_time': total_time
-            }
-        }, f, indent=2)
+    _write_json(Path(summary_file), {
+        'timestamp': datetime.now().isoformat(),
+        'summary_stats': summary_stats,
+        'totals': {
+            'servicers': len(summary_stats),
+            'files': total_files,
+            'terms': total_terms,
+            'processing_time': total_time
+        }
+    })
     
     print(f"\n📄 Summary saved to: {summary_file}")
     
@@ -154,34 +222,63 @@ def process_by_date_range():
     discoverer = FinancialPatternDiscovery()
     base_dir = Path("data/reports")
     
-    # Define date ranges
+    # Define date ranges by the YYYYMM stamps in file names
     date_ranges = {
-        'Q1_2024': ['*202401*.xlsx', '*202402*.xlsx', '*202403*.xlsx'],
-        'Q2_2024': ['*202404*.xlsx', '*202405*.xlsx', '*202406*.xlsx'],
-        'Q3_2024': ['*202407*.xlsx', '*202408*.xlsx', '*202409*.xlsx'],
-        'Q4_2024': ['*202410*.xlsx', '*202411*.xlsx', '*202412*.xlsx']
+        'Q1_2024': ['202401', '202402', '202403'],
+        'Q2_2024': ['202404', '202405', '202406'],
+        'Q3_2024': ['202407', '202408', '202409'],
+        'Q4_2024': ['202410', '202411', '202412']
     }
+    month_to_quarter = {month: quarter for quarter, months in date_ranges.items() for month in months}
+    month_pattern = re.compile('|'.join(month_to_quarter))
     
-    for quarter, patterns in date_ranges.items():
-        print(f"Processing {quarter}...")
-        
-        # Collect all files for this quarter
-        quarter_files = []
-        for pattern in patterns:
-            files = list(base_dir.rglob(pattern))
-            quarter_files.extend(files)
+    # Walk the tree once and bucket each workbook by the months in its name
+    quarter_buckets = defaultdict(list)
+    for file_path in base_dir.rglob('*.xlsx'):
+        quarters = {month_to_quarter[month] for month in month_pattern.findall(file_path.name)}
+        for quarter in quarters:
+            quarter_buckets[quarter].append(file_path)
+    
+    # Discovery logs its own progress; the per-quarter status lines are
+    # collected and written once after the loop
+    status_lines = []
+    for quarter in date_ranges:
+        status_lines.append(f"Processing {quarter}...")
+        quarter_files = quarter_buckets.get(quarter, [])
         
         if quarter_files:
-            print(f"  Found {len(quarter_files)} files")
+            status_lines.append(f"  Found {len(quarter_files)} files")
             
             results = discoverer.process_files(
                 quarter_files,
                 Path(f"patterns_{quarter}.xlsx")
             )
             
-            print(f"  ✅ Completed: {results['n_clusters']} pattern clusters found\n")
+            status_lines.append(f"  ✅ Completed: {results['n_clusters']} pattern clusters found\n")
         else:
-            print(f"  ⚠️  No files found for {quarter}\n")
+            status_lines.append(f"  ⚠️  No files found for {quarter}\n")
+    print("\n".join(status_lines))
+
+
+def _open_processed_index(db_path: Path, legacy_log: Path) -> sqlite3.Connection:
+    """Open the processed-file index, importing the old JSON log once
+    
+    Paths are the table's primary key, so membership checks are index
+    lookups and each run only inserts its new files in one transaction.
+    """
+    connection = sqlite3.connect(db_path)
+    connection.execute('CREATE TABLE IF NOT EXISTS processed (path TEXT PRIMARY KEY)')
+    
+    is_empty = connection.execute('SELECT 1 FROM processed LIMIT 1').fetchone() is None
+    if is_empty and legacy_log.exists():
+        legacy_paths = _read_json(legacy_log)
+        with connection:
+            connection.executemany(
+                'INSERT OR IGNORE INTO processed (path) VALUES (?)',
+                ((path,) for path in legacy_paths)
+            )
+    
+    return connection
 
 
 def incremental_batch_processing():
@@ -190,48 +287,62 @@ def incremental_batch_processing():
     print("\n🔄 Incremental batch processing\n")
     
     # Track processed files
-    processed_files_log = Path("processed_files.json")
-    
-    # Load previously processed files
-    if processed_files_log.exists():
-        with open(processed_files_log, 'r') as f:
-            processed_files = set(json.load(f))
-    else:
-        processed_files = set()
-    
-    # Find all Excel files
-    all_files = list(Path("data").rglob("*.xlsx"))
-    
-    # Filter new files only
-    new_files = [f for f in all_files if str(f) not in processed_files]
+    processed_index = _open_processed_index(Path("processed_files.db"), Path("processed_files.json"))
     
-    if not new_files:
-        print("No new files to process")
-        return
+    def is_processed(path: str) -> bool:
+        return processed_index.execute(
+            'SELECT 1 FROM processed WHERE path = ?', (path,)
+        ).fetchone() is not None
     
-    print(f"Found {len(new_files)} new files to process")
-    print(f"Previously processed: {len(processed_files)} files")
-    
-    # Process new files
-    discoverer = FinancialPatternDiscovery()
-    results = discoverer.process_files(
-        new_files,
-        Path(f"incremental_patterns_{datetime.now().strftime('%Y%m%d')}.xlsx")
-    )
-    
-    # Update processed files log
-    for f in new_files:
-        processed_files.add(str(f))
-    
-    with open(processed_files_log, 'w') as f:
-        json.dump(list(processed_files), f, indent=2)
-    
-    print(f"\n✅ Processed {len(new_files)} new files")
-    print(f"Total files in history: {len(processed_files)}")
+    try:
+        # Stream the directory walk and keep only new files, without
+        # materializing the full list of Excel paths first. Each path is
+        # converted to its string key once and reused for the index update.
+        new_files = []
+        new_file_keys = []
+        for file_path in Path("data").rglob("*.xlsx"):
+            file_key = os.fspath(file_path)
+            if not is_processed(file_key):
+                new_files.append(file_path)
+                new_file_keys.append(file_key)
+        
+        if not new_files:
+            print("No new files to process")
+            return
+        
+        processed_count = processed_index.execute('SELECT COUNT(*) FROM processed').fetchone()[0]
+        print(f"Found {len(new_files)} new files to process")
+        print(f"Previously processed: {processed_count} files")
+        
+        # Process new files
+        discoverer = FinancialPatternDiscovery()
+        results = discoverer.process_files(
+            new_files,
+            Path(f"incremental_patterns_{datetime.now().strftime('%Y%m%d')}.xlsx")
+        )
+        
+        # Update processed files index in a single transaction
+        with processed_index:
+            processed_index.executemany(
+                'INSERT OR IGNORE INTO processed (path) VALUES (?)',
+                ((file_key,) for file_key in new_file_keys)
+            )
+        
+        total_count = processed_index.execute('SELECT COUNT(*) FROM processed').fetchone()[0]
+        print(f"\n✅ Processed {len(new_files)} new files")
+        print(f"Total files in history: {total_count}")
+    finally:
+        processed_index.close()
 
 
 if __name__ == "__main__":
     import argparse
+    import multiprocessing as mp
+    
+    # Forked workers inherit the already-imported sklearn/numpy stack instead
+    # of re-importing it; fork is not safe on macOS/Windows, so keep their default
+    if sys.platform.startswith('linux'):
+        mp.set_start_method('fork', force=True)
     
     parser = argparse.ArgumentParser(description="Batch processing examples")
     parser.add_argument(
@@ -3,16 +3,35 @@
 NLTK Customization Script for Financial Pattern Discovery
 """
 
+import re
+import shlex
 import sys
 import json
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Pattern
+
+# Optional fast JSON (orjson); stdlib json is the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from financial_pattern_discovery.config import NLTKConfig
+
+# Term lists held as sets in memory and saved as sorted JSON lists
+_TERM_SET_KEYS = ("financial_terms_to_preserve", "financial_stopwords_to_remove")
+
 
-from financial_pattern_discovery.config import NLTKConfig, ProcessingConfig, FinancialTerms
-from financial_pattern_discovery.extractor import EnhancedFinancialTermExtractor, NLTKCustomizer
+def _emit(lines: List[str]):
+    """Write a block of output lines to stdout in one call"""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 class NLTKCustomizer:
@@ -20,13 +39,28 @@ class NLTKCustomizer:
     
     def __init__(self):
         self.config_file = Path("nltk_financial_config.json")
-        self.current_config = self._load_or_create_config()
+        # Entity pattern source -> compiled regex, so each pattern is
+        # compiled (and validated) only once per session
+        self._compiled_patterns: Dict[str, Pattern] = {}
+        # NLTKConfig built from the current settings; reset on every change
+        self._config_object: Optional[NLTKConfig] = None
+    
+    @cached_property
+    def current_config(self) -> Dict:
+        """Current settings, loaded on first access"""
+        return self._load_or_create_config()
     
     def _load_or_create_config(self) -> Dict:
         """Load existing config or create default"""
         if self.config_file.exists():
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
+            if ORJSON_AVAILABLE:
+                config = orjson.loads(self.config_file.read_bytes())
+            else:
+                with open(self.config_file, 'r') as f:
+                    config = json.load(f)
+            for key in _TERM_SET_KEYS:
+                config[key] = set(config[key])
+            return config
         else:
             return self._create_default_config()
     
@@ -41,8 +75,8 @@ class NLTKCustomizer:
                 "financial_relevance_threshold": nltk_config.financial_relevance_threshold,
                 "preserve_financial_plurals": nltk_config.preserve_financial_plurals
             },
-            "financial_terms_to_preserve": list(nltk_config.financial_terms_to_preserve),
-            "financial_stopwords_to_remove": list(nltk_config.financial_stopwords_to_remove),
+            "financial_terms_to_preserve": set(nltk_config.financial_terms_to_preserve),
+            "financial_stopwords_to_remove": set(nltk_config.financial_stopwords_to_remove),
             "custom_lemma_exceptions": nltk_config.custom_lemma_exceptions,
             "pos_tag_weights": nltk_config.important_pos_tags,
             "entity_patterns": nltk_config.financial_entity_patterns
@@ -50,68 +84,106 @@ class NLTKCustomizer:
     
     def save_config(self):
         """Save current configuration to file"""
-        with open(self.config_file, 'w') as f:
-            json.dump(self.current_config, f, indent=2)
+        # Sorted lists keep the saved file stable between runs
+        payload = dict(self.current_config)
+        for key in _TERM_SET_KEYS:
+            payload[key] = sorted(payload[key])
+        
+        if ORJSON_AVAILABLE:
+            self.config_file.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.config_file, 'w') as f:
+                json.dump(payload, f, indent=2)
         print(f"✅ Configuration saved to {self.config_file}")
     
     def show_current_settings(self):
         """Display current NLTK settings"""
-        print("\n🔧 Current NLTK Financial Settings")
-        print("=" * 50)
-        
         features = self.current_config["nltk_features"]
-        print(f"Lemmatization: {'✅ Enabled' if features['use_lemmatization'] else '❌ Disabled'}")
-        print(f"POS Tagging: {'✅ Enabled' if features['use_pos_tagging'] else '❌ Disabled'}")
-        print(f"Named Entity Recognition: {'✅ Enabled' if features['use_named_entity_recognition'] else '❌ Disabled'}")
-        print(f"Financial Relevance Threshold: {features['financial_relevance_threshold']}")
-        print(f"Preserve Financial Plurals: {'✅ Yes' if features['preserve_financial_plurals'] else '❌ No'}")
-        
-        print(f"\n📋 Financial Terms to Preserve: {len(self.current_config['financial_terms_to_preserve'])} terms")
-        print(f"🚫 Stopwords to Remove: {len(self.current_config['financial_stopwords_to_remove'])} terms")
-        print(f"🔄 Custom Lemma Exceptions: {len(self.current_config['custom_lemma_exceptions'])} mappings")
-        print(f"🏷️  POS Tag Weights: {len(self.current_config['pos_tag_weights'])} tags configured")
-        print(f"🎯 Entity Patterns: {len(self.current_config['entity_patterns'])} patterns")
+        _emit([
+            "\n🔧 Current NLTK Financial Settings",
+            "=" * 50,
+            f"Lemmatization: {'✅ Enabled' if features['use_lemmatization'] else '❌ Disabled'}",
+            f"POS Tagging: {'✅ Enabled' if features['use_pos_tagging'] else '❌ Disabled'}",
+            f"Named Entity Recognition: {'✅ Enabled' if features['use_named_entity_recognition'] else '❌ Disabled'}",
+            f"Financial Relevance Threshold: {features['financial_relevance_threshold']}",
+            f"Preserve Financial Plurals: {'✅ Yes' if features['preserve_financial_plurals'] else '❌ No'}",
+            f"\n📋 Financial Terms to Preserve: {len(self.current_config['financial_terms_to_preserve'])} terms",
+            f"🚫 Stopwords to Remove: {len(self.current_config['financial_stopwords_to_remove'])} terms",
+            f"🔄 Custom Lemma Exceptions: {len(self.current_config['custom_lemma_exceptions'])} mappings",
+            f"🏷️  POS Tag Weights: {len(self.current_config['pos_tag_weights'])} tags configured",
+            f"🎯 Entity Patterns: {len(self.current_config['entity_patterns'])} patterns",
+        ])
     
     def add_financial_terms(self, terms: List[str]):
         """Add terms that should always be preserved"""
-        existing = set(self.current_config["financial_terms_to_preserve"])
-        new_terms = [term.lower().strip() for term in terms if term.lower().strip() not in existing]
+        existing = self.current_config["financial_terms_to_preserve"]
+        normalized = {term.lower().strip() for term in terms}
+        normalized.discard('')
+        new_terms = normalized - existing
         
         if new_terms:
-            self.current_config["financial_terms_to_preserve"].extend(new_terms)
-            print(f"✅ Added {len(new_terms)} new financial terms: {new_terms}")
+            existing |= new_terms
+            self._config_object = None
+            print(f"✅ Added {len(new_terms)} new financial terms: {sorted(new_terms)}")
         else:
             print("ℹ️  All terms already in preserved list")
     
     def add_stopwords(self, words: List[str]):
         """Add words that should be filtered out as noise"""
-        existing = set(self.current_config["financial_stopwords_to_remove"])
-        new_words = [word.lower().strip() for word in words if word.lower().strip() not in existing]
+        existing = self.current_config["financial_stopwords_to_remove"]
+        normalized = {word.lower().strip() for word in words}
+        normalized.discard('')
+        new_words = normalized - existing
         
         if new_words:
-            self.current_config["financial_stopwords_to_remove"].extend(new_words)
-            print(f"✅ Added {len(new_words)} new stopwords: {new_words}")
+            existing |= new_words
+            self._config_object = None
+            print(f"✅ Added {len(new_words)} new stopwords: {sorted(new_words)}")
         else:
             print("ℹ️  All words already in stopword list")
     
     def add_lemma_exceptions(self, mappings: Dict[str, str]):
         """Add custom lemmatization mappings"""
         existing = self.current_config["custom_lemma_exceptions"]
-        new_mappings = {k.lower(): v.lower() for k, v in mappings.items() if k.lower() not in existing}
+        new_mappings = {}
+        for word, lemma in mappings.items():
+            word = word.lower()
+            if word not in existing:
+                new_mappings[word] = lemma.lower()
         
         if new_mappings:
             existing.update(new_mappings)
+            self._config_object = None
             print(f"✅ Added {len(new_mappings)} new lemma mappings: {new_mappings}")
         else:
             print("ℹ️  All mappings already exist")
     
+    def _compile_entity_pattern(self, pattern: str) -> Pattern:
+        """Compile a pattern with the extractor's flags, reusing earlier compiles"""
+        compiled = self._compiled_patterns.get(pattern)
+        if compiled is None:
+            compiled = re.compile(pattern, re.IGNORECASE)
+            self._compiled_patterns[pattern] = compiled
+        return compiled
+    
     def add_entity_patterns(self, patterns: List[str]):
         """Add regex patterns for financial entity recognition"""
         existing = set(self.current_config["entity_patterns"])
-        new_patterns = [pattern for pattern in patterns if pattern not in existing]
+        new_patterns = []
+        for pattern in patterns:
+            if pattern in existing:
+                continue
+            try:
+                self._compile_entity_pattern(pattern)
+            except re.error as e:
+                print(f"❌ Invalid regex pattern {pattern!r}: {e}")
+                continue
+            existing.add(pattern)
+            new_patterns.append(pattern)
         
         if new_patterns:
             self.current_config["entity_patterns"].extend(new_patterns)
+            self._config_object = None
             print(f"✅ Added {len(new_patterns)} new entity patterns")
         else:
             print("ℹ️  All patterns already exist")
@@ -121,6 +193,7 @@ class NLTKCustomizer:
         if 0.0 <= threshold <= 1.0:
             old_threshold = self.current_config["nltk_features"]["financial_relevance_threshold"]
             self.current_config["nltk_features"]["financial_relevance_threshold"] = threshold
+            self._config_object = None
             print(f"✅ Financial relevance threshold changed: {old_threshold} → {threshold}")
             if threshold < 0.2:
                 print("⚠️  Low threshold may include more noise")
@@ -175,7 +248,15 @@ class NLTKCustomizer:
             print(f"❌ Unknown document type. Available: {available}")
     
     def generate_config_object(self) -> NLTKConfig:
-        """Generate NLTKConfig object from current settings"""
+        """Generate NLTKConfig object from current settings
+        
+        The object is cached until the settings change. Term sets are
+        frozensets and the other containers are copies, so the shared
+        object cannot be changed through, or drift from, the customizer.
+        """
+        if self._config_object is not None:
+            return self._config_object
+        
         config = NLTKConfig()
         
         # Update features
@@ -187,12 +268,13 @@ class NLTKCustomizer:
         config.preserve_financial_plurals = features["preserve_financial_plurals"]
         
         # Update term sets
-        config.financial_terms_to_preserve = set(self.current_config["financial_terms_to_preserve"])
-        config.financial_stopwords_to_remove = set(self.current_config["financial_stopwords_to_remove"])
-        config.custom_lemma_exceptions = self.current_config["custom_lemma_exceptions"]
-        config.important_pos_tags = self.current_config["pos_tag_weights"]
-        config.financial_entity_patterns = self.current_config["entity_patterns"]
+        config.financial_terms_to_preserve = frozenset(self.current_config["financial_terms_to_preserve"])
+        config.financial_stopwords_to_remove = frozenset(self.current_config["financial_stopwords_to_remove"])
+        config.custom_lemma_exceptions = dict(self.current_config["custom_lemma_exceptions"])
+        config.important_pos_tags = dict(self.current_config["pos_tag_weights"])
+        config.financial_entity_patterns = list(self.current_config["entity_patterns"])
         
+        self._config_object = config
         return config
 
 
@@ -270,6 +352,75 @@ def interactive_customization():
             print("❌ Invalid choice")
 
 
+def run_batch(script: str) -> int:
+    """Apply semicolon-separated customization commands without prompting
+    
+    Example:
+        add-terms waterfall,enhancement; threshold 0.35; optimize asset_backed_securities; save
+    
+    The script is tokenized with shlex, so quote regex patterns with
+    single quotes to keep their backslashes (and any ";" inside them).
+    Nothing is written unless the script includes "save". Returns a
+    process exit code.
+    """
+    customizer = NLTKCustomizer()
+    
+    def split_items(args: List[str]) -> List[str]:
+        return [item.strip() for arg in args for item in arg.split(",") if item.strip()]
+    
+    def parse_lemmas(args: List[str]) -> Dict[str, str]:
+        mappings = {}
+        for pair in split_items(args):
+            word, separator, lemma = pair.partition(":")
+            if separator:
+                mappings[word.strip()] = lemma.strip()
+        return mappings
+    
+    commands = {
+        "add-terms": lambda args: customizer.add_financial_terms(split_items(args)),
+        "add-stopwords": lambda args: customizer.add_stopwords(split_items(args)),
+        "add-lemmas": lambda args: customizer.add_lemma_exceptions(parse_lemmas(args)),
+        "add-patterns": lambda args: customizer.add_entity_patterns(args),
+        "threshold": lambda args: customizer.tune_relevance_threshold(float(args[0])),
+        "optimize": lambda args: customizer.optimize_for_document_type(args[0].lower()),
+        "show": lambda args: customizer.show_current_settings(),
+        "save": lambda args: customizer.save_config(),
+    }
+    
+    # Tokenize the whole script once, so a quoted ";" (e.g. inside a regex)
+    # stays part of its argument; only unquoted ";" separates commands
+    lexer = shlex.shlex(script, posix=True, punctuation_chars=";")
+    lexer.whitespace_split = True
+    try:
+        tokens = list(lexer)
+    except ValueError as e:
+        print(f"❌ Invalid command script: {e}")
+        return 1
+    
+    statements = [[]]
+    for token in tokens:
+        if token.strip(";"):
+            statements[-1].append(token)
+        else:
+            statements.append([])
+    
+    for statement in statements:
+        if not statement:
+            continue
+        name, args = statement[0], statement[1:]
+        command = commands.get(name)
+        if command is None:
+            print(f"❌ Unknown command '{name}'. Available: {', '.join(commands)}")
+            return 1
+        try:
+            command(args)
+        except (IndexError, ValueError) as e:
+            print(f"❌ Invalid arguments for '{name}': {e}")
+            return 1
+    
+    return 0
+
+
 def load_custom_config() -> NLTKConfig:
     """Load saved custom configuration"""
     customizer = NLTKCustomizer()
@@ -310,9 +461,21 @@ def quick_optimization_examples():
 
 
 if __name__ == "__main__":
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Customize NLTK financial settings")
+    parser.add_argument('--examples', action='store_true', help='Show quick optimization examples')
+    parser.add_argument(
+        '--batch',
+        metavar='COMMANDS',
+        help='Run semicolon-separated commands instead of the interactive menu, '
+             'e.g. "add-terms waterfall,enhancement; threshold 0.35; save"'
+    )
+    args = parser.parse_args()
     
-    if len(sys.argv) > 1 and sys.argv[1] == "--examples":
+    if args.examples:
         quick_optimization_examples()
+    elif args.batch:
+        sys.exit(run_batch(args.batch))
     else:
         interactive_customization()
\ No newline at end of file
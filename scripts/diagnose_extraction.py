@@ -4,102 +4,249 @@ Diagnostic tool to analyze term extraction from Excel files
 Helps understand what terms are being found and why clustering might be limited
 """
 
+import heapq
+import os
 import sys
 from pathlib import Path
-from collections import Counter
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
+from itertools import islice
+from typing import List, Optional, Tuple
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
 
 from financial_pattern_discovery import FinancialTermExtractor, ProcessingConfig
 
 # =============================================================================
 # CONFIGURATION - Modify these paths as needed
 # =============================================================================
-SOURCE_DIRECTORY = str(Path(__file__).parent.parent / "reports")  # Points to the reports subfolder
+SOURCE_DIRECTORY = _REPO_ROOT / "reports"       # Points to the reports subfolder
 SOURCE_FILE = None                              # Set to a specific file path to analyze just one file, or None to analyze directory
 FILE_PATTERN = "*.xlsx"                         # File pattern to match when analyzing directory
 MAX_FILES_TO_ANALYZE = 5                        # Maximum number of files to analyze in detail
+MIN_GOOD_VARIETY = 20                           # Unique terms needed for a "good variety" verdict
+MAX_TERMS_LISTED = 200                          # Cap on each file's "All unique terms" listing
 # =============================================================================
 
+# Shared extractor, built on first use so NLTK resources load once per run
+_EXTRACTOR = None
 
-def diagnose_file(file_path: Path, show_all: bool = False):
-    """Diagnose term extraction from a single file"""
-    print(f"\n{'='*70}")
-    print(f"Analyzing: {file_path.name}")
-    print(f"{'='*70}")
+
+def _get_extractor() -> FinancialTermExtractor:
+    """Return the shared extractor, creating it on first call"""
+    global _EXTRACTOR
+    if _EXTRACTOR is None:
+        _EXTRACTOR = FinancialTermExtractor(ProcessingConfig())
+    return _EXTRACTOR
+
+
+# Extracted terms keyed by (path, mtime_ns, size), least recently used
+# first. Repeated diagnostic runs in the same session (e.g. while tuning
+# settings) skip re-parsing workbooks that have not changed. The cache
+# lives in the parent process; worker processes only handle misses.
+_TERMS_CACHE: "OrderedDict[Tuple[str, int, int], Tuple[str, ...]]" = OrderedDict()
+_TERMS_CACHE_SIZE = 256
+
+
+def _extract_terms(path_str: str) -> Tuple[str, ...]:
+    """Extract a file's terms without caching (the worker entry point)"""
+    _, term_info_list = _get_extractor().extract_headers_from_excel(Path(path_str))
+    return tuple(info['term'] for info in term_info_list)
+
+
+def _cache_key(file_path: Path) -> Tuple[str, int, int]:
+    stat = file_path.stat()
+    return str(file_path), stat.st_mtime_ns, stat.st_size
+
+
+def _cached_terms(key: Tuple[str, int, int]) -> Optional[Tuple[str, ...]]:
+    terms = _TERMS_CACHE.get(key)
+    if terms is not None:
+        _TERMS_CACHE.move_to_end(key)
+    return terms
+
+
+def _remember_terms(key: Tuple[str, int, int], terms: Tuple[str, ...]):
+    _TERMS_CACHE[key] = terms
+    _TERMS_CACHE.move_to_end(key)
+    if len(_TERMS_CACHE) > _TERMS_CACHE_SIZE:
+        _TERMS_CACHE.popitem(last=False)
+
+
+def _file_terms(file_path: Path) -> List[str]:
+    """Extract one file's terms through the cache"""
+    key = _cache_key(file_path)
+    terms = _cached_terms(key)
+    if terms is None:
+        terms = _extract_terms(key[0])
+        _remember_terms(key, terms)
+    return list(terms)
+
+
+def _count_matches(directory: Path, pattern: str) -> int:
+    """Count entries matching a glob pattern without building Path objects"""
+    if '/' in pattern or os.sep in pattern or '**' in pattern:
+        return sum(1 for _ in directory.glob(pattern))
+    with os.scandir(directory) as entries:
+        return sum(1 for entry in entries if fnmatch(entry.name, pattern))
+
+
+def _emit(lines: List[str]):
+    """Write a block of report lines to stdout in one call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _init_diagnose_worker():
+    """Create the shared extractor once in each worker process"""
+    _get_extractor()
+
+
+def diagnose_file(file_path: Path, show_all: bool = False, terms: Optional[List[str]] = None):
+    """Diagnose term extraction from a single file
     
-    # Initialize extractor
-    config = ProcessingConfig()
-    extractor = FinancialTermExtractor(config)
+    Terms already extracted elsewhere (e.g. by a worker process) can be
+    passed in; otherwise they are extracted here.
+    """
+    out = [
+        f"\n{'='*70}",
+        f"Analyzing: {file_path.name}",
+        f"{'='*70}",
+    ]
     
     # Extract terms
-    terms = extractor.extract_headers_from_excel(file_path)
+    if terms is None:
+        terms = _file_terms(file_path)
     
-    print(f"\nExtraction Results:")
-    print(f"  Total terms found: {len(terms)}")
-    print(f"  Unique terms: {len(set(terms))}")
+    unique_terms = set(terms)
+    out.extend([
+        f"\nExtraction Results:",
+        f"  Total terms found: {len(terms)}",
+        f"  Unique terms: {len(unique_terms)}",
+    ])
     
     if not terms:
-        print("\n⚠️  No terms were extracted from this file!")
-        print("\nPossible reasons:")
-        print("  1. The file might not contain recognizable financial headers")
-        print("  2. Headers might be in unexpected formats")
-        print("  3. The file might be using numeric codes instead of text labels")
+        out.extend([
+            "\n⚠️  No terms were extracted from this file!",
+            "\nPossible reasons:",
+            "  1. The file might not contain recognizable financial headers",
+            "  2. Headers might be in unexpected formats",
+            "  3. The file might be using numeric codes instead of text labels",
+        ])
+        _emit(out)
         return []
     
     # Count term frequency
     term_counts = Counter(terms)
     
-    print(f"\nMost common terms:")
+    out.append(f"\nMost common terms:")
     for term, count in term_counts.most_common(10):
-        print(f"  - '{term}' (appears {count} times)")
+        out.append(f"  - '{term}' (appears {count} times)")
     
-    if show_all or len(set(terms)) <= 20:
-        print(f"\nAll unique terms found:")
-        for term in sorted(set(terms)):
-            print(f"  - '{term}'")
+    if show_all or len(unique_terms) <= 20:
+        out.append(f"\nAll unique terms found:")
+        # Display only: past the cap, select the first terms alphabetically
+        # with a bounded heap instead of sorting every unique term
+        if len(unique_terms) > MAX_TERMS_LISTED:
+            listed = heapq.nsmallest(MAX_TERMS_LISTED, unique_terms)
+        else:
+            listed = sorted(unique_terms)
+        for term in listed:
+            out.append(f"  - '{term}'")
+        if len(unique_terms) > len(listed):
+            out.append(f"  ... and {len(unique_terms) - len(listed)} more")
     
+    _emit(out)
     return terms
 
 
-def diagnose_directory(directory: Path, pattern: str = "*.xlsx", limit: int = 5):
-    """Diagnose term extraction from a directory"""
+def diagnose_directory(directory: Path, pattern: str = "*.xlsx", limit: int = 5, exhaustive: bool = False):
+    """Diagnose term extraction from a directory
+    
+    Analysis stops early once the unique terms comfortably exceed the
+    "good variety" bar, since further files would not change the verdict;
+    pass exhaustive=True (--exhaustive) to always analyse `limit` files.
+    """
     print(f"\n{'='*70}")
     print(f"Diagnosing Directory: {directory}")
     print(f"Pattern: {pattern}")
     print(f"{'='*70}")
     
-    # Find files
-    files = list(directory.glob(pattern))
-    if not files:
+    # Find files; only the first `limit` are analysed, so stop the glob
+    # there and count the rest by name alone
+    batch = list(islice(directory.glob(pattern), limit))
+    if not batch:
         print(f"\n❌ No files matching '{pattern}' found in {directory}")
         return
     
-    print(f"\nFound {len(files)} files")
+    print(f"\nFound {_count_matches(directory, pattern)} files")
     
-    # Process files
-    all_terms = []
-    file_term_map = {}
+    # Aggregates are updated per file in a single pass, so only the
+    # unique terms are kept rather than every extracted term
+    overall_counts = Counter()
+    unique_terms = set()
+    word_counter = Counter()  # words across unique terms
+    terms_per_file = []
     
     # Analyze first few files in detail
-    print(f"\nAnalyzing first {min(limit, len(files))} files in detail:")
+    print(f"\nAnalyzing first {len(batch)} files in detail:")
+    
+    # Files already in the term cache are answered here. Extraction of the
+    # rest is independent per file, so run it in a process pool and report
+    # the results in file order as they become available; the parent fills
+    # the cache with what the workers return.
+    keys = [_cache_key(file_path) for file_path in batch]
+    cached = [_cached_terms(key) for key in keys]
+    misses = [key for key, terms in zip(keys, cached) if terms is None]
+    max_workers = min(os.cpu_count() or 1, len(misses))
+    executor = None
+    futures = {}
+    if max_workers > 1:
+        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_diagnose_worker)
+        futures = {key: executor.submit(_extract_terms, key[0]) for key in misses}
     
-    for i, file_path in enumerate(files[:limit]):
-        terms = diagnose_file(file_path, show_all=True)
-        all_terms.extend(terms)
-        file_term_map[file_path.name] = terms
+    def job(key, terms):
+        if terms is None:
+            future = futures.get(key)
+            terms = future.result() if future is not None else _extract_terms(key[0])
+            _remember_terms(key, terms)
+        return terms
+    
+    try:
+        for files_done, (file_path, key, terms) in enumerate(zip(batch, keys, cached), 1):
+            # Headers repeat heavily across reports; interning makes repeats
+            # share one string object in the counters and sets below
+            terms = diagnose_file(file_path, show_all=True, terms=list(map(sys.intern, job(key, terms))))
+            overall_counts.update(terms)
+            file_unique_terms = set(terms)
+            terms_per_file.append(len(file_unique_terms))
+            for term in file_unique_terms - unique_terms:
+                word_counter.update(term.split())
+            unique_terms |= file_unique_terms
+            
+            if (not exhaustive and files_done >= 3 and files_done < len(batch)
+                    and len(unique_terms) >= 2 * MIN_GOOD_VARIETY):
+                print(f"\n✅ Early exit after {files_done} files — variety saturated "
+                      f"(use --exhaustive for full statistics)")
+                break
+    finally:
+        if executor is not None:
+            # Drop files not yet started after an early exit
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown()
     
     # Overall statistics
     print(f"\n{'='*70}")
     print(f"OVERALL STATISTICS")
     print(f"{'='*70}")
     
-    unique_terms = set(all_terms)
-    print(f"\nTotal terms extracted: {len(all_terms)}")
+    print(f"\nTotal terms extracted: {sum(overall_counts.values())}")
     print(f"Unique terms: {len(unique_terms)}")
     
     # Term frequency across files
-    overall_counts = Counter(all_terms)
     
     print(f"\nMost common terms across all files:")
     for term, count in overall_counts.most_common(20):
@@ -117,7 +264,7 @@ def diagnose_directory(directory: Path, pattern: str = "*.xlsx", limit: int = 5)
         print("  1. Check if files contain expected financial headers")
         print("  2. Verify files are not password protected or corrupted")
         print("  3. Consider processing more files to get more variety")
-    elif len(unique_terms) < 20:
+    elif len(unique_terms) < MIN_GOOD_VARIETY:
         print(f"\n⚠️  Limited variety: {len(unique_terms)} unique terms")
         print("  Clustering will work but with limited granularity.")
         print(f"  Recommended clusters: {min(len(unique_terms) // 2, 5)}")
@@ -131,7 +278,6 @@ def diagnose_directory(directory: Path, pattern: str = "*.xlsx", limit: int = 5)
     print(f"FILE VARIETY ANALYSIS")
     print(f"{'='*70}")
     
-    terms_per_file = [len(set(terms)) for terms in file_term_map.values()]
     if terms_per_file:
         avg_terms = sum(terms_per_file) / len(terms_per_file)
         print(f"\nAverage unique terms per file: {avg_terms:.1f}")
@@ -146,11 +292,6 @@ def diagnose_directory(directory: Path, pattern: str = "*.xlsx", limit: int = 5)
     # Check if all terms are very similar
     if unique_terms:
         # Check if most terms contain the same words
-        word_counter = Counter()
-        for term in unique_terms:
-            words = term.split()
-            word_counter.update(words)
-        
         common_words = word_counter.most_common(5)
         if common_words and common_words[0][1] > len(unique_terms) * 0.8:
             print(f"\n⚠️  Most terms contain '{common_words[0][0]}' - low variety")
@@ -174,7 +315,7 @@ def diagnose_directory(directory: Path, pattern: str = "*.xlsx", limit: int = 5)
         print("3. Adjust clustering parameters if needed")
 
 
-def main():
+def main(exhaustive: bool = False):
     """Main diagnostic function"""
     
     print("Financial Pattern Discovery - Diagnostic Tool")
@@ -196,7 +337,7 @@ def main():
                 print(f"❌ Directory not found: {dir_path}")
                 print(f"Please update SOURCE_DIRECTORY in the script to point to your Excel files directory")
                 return 1
-            diagnose_directory(dir_path, FILE_PATTERN, MAX_FILES_TO_ANALYZE)
+            diagnose_directory(dir_path, FILE_PATTERN, MAX_FILES_TO_ANALYZE, exhaustive=exhaustive)
         
         return 0
         
@@ -208,4 +349,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main(exhaustive="--exhaustive" in sys.argv[1:]))
\ No newline at end of file
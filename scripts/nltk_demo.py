@@ -4,77 +4,135 @@ Complete demonstration of NLTK customization features for financial pattern disc
 """
 
 import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import List
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from financial_pattern_discovery import FinancialPatternDiscovery
 from financial_pattern_discovery.config import NLTKConfig, ProcessingConfig
-from financial_pattern_discovery.extractor import EnhancedFinancialTermExtractor
+
+__all__ = [
+    "demonstrate_nltk_features",
+    "abs_optimized_config",
+    "servicing_optimized_config",
+    "trustee_optimized_config",
+]
+
+# Preset vocabularies, built once at import and merged into configs with
+# set-to-set updates
+_ABS_CORE_TERMS = frozenset({
+    'waterfall', 'overcollateralization', 'enhancement', 'trigger',
+    'subordination', 'senior', 'subordinate', 'tranche', 'tranches'
+})
+_ABS_TERMS = _ABS_CORE_TERMS | frozenset({
+    'class', 'note', 'notes', 'certificate', 'certificates'
+})
+_ABS_NOTE_PATTERNS = (
+    r'\b[Cc]lass\s+[A-F]\s+[Nn]otes?\b',
+    r'\b[Ss]enior\s+[Nn]otes?\b',
+    r'\b[Ss]ubordinate\s+[Nn]otes?\b',
+)
+_ABS_PATTERNS = _ABS_NOTE_PATTERNS + (
+    r'\b[Oo]vercollateralization\s+[Tt]est\b',
+)
+
+_SERVICING_CORE_TERMS = frozenset({
+    'servicer', 'servicing', 'collection', 'distribution',
+    'advances', 'fees', 'compensations', 'delinquency'
+})
+_SERVICING_TERMS = _SERVICING_CORE_TERMS | frozenset({
+    'prepayment', 'default', 'loss', 'recovery'
+})
+_SERVICING_CORE_STOPWORDS = frozenset({'report', 'statement', 'monthly', 'quarterly'})
+_SERVICING_STOPWORDS = _SERVICING_CORE_STOPWORDS | frozenset({'period'})
+
+_TRUSTEE_TERMS = frozenset({
+    'trustee', 'indenture', 'owner', 'backup',
+    'administration', 'fees', 'eligible', 'successor'
+})
+
+# Decorative banners are only printed for interactive terminals
+_BANNER = sys.stdout.isatty()
+_SEP = "=" * 70
+_RULE = "-" * 40
+
+_USAGE_EXAMPLE = """
+    # Step 1: Create optimized configuration
+    abs_config = NLTKConfig()
+    abs_config.financial_terms_to_preserve.update(['waterfall', 'enhancement'])
+    abs_config.financial_relevance_threshold = 0.35
+    
+    # Step 2: Apply to processing config
+    processing_config = ProcessingConfig()
+    processing_config.nltk_config = abs_config
+    
+    # Step 3: Initialize system with custom config
+    discoverer = FinancialPatternDiscovery(processing_config=processing_config)
+    
+    # Step 4: Process files with enhanced NLTK
+    results = discoverer.process_files(file_paths, output_path)
+    """
+
+
+def _emit(lines: List[str]):
+    """Write a block of output lines to stdout in one call"""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def demonstrate_nltk_features():
     """Comprehensive demonstration of NLTK customization features"""
     
-    print("🎯 NLTK Financial Pattern Discovery - Complete Demonstration")
-    print("=" * 70)
+    out = []
+    if _BANNER:
+        out += ["🎯 NLTK Financial Pattern Discovery - Complete Demonstration", _SEP]
     
     # 1. Default NLTK Configuration
-    print("\n1️⃣ DEFAULT NLTK CONFIGURATION")
-    print("-" * 40)
+    out += ["\n1️⃣ DEFAULT NLTK CONFIGURATION", _RULE]
     
     default_config = NLTKConfig()
-    print(f"✅ Lemmatization: {default_config.use_lemmatization}")
-    print(f"✅ POS Tagging: {default_config.use_pos_tagging}")
-    print(f"✅ Named Entity Recognition: {default_config.use_named_entity_recognition}")
-    print(f"📊 Financial Relevance Threshold: {default_config.financial_relevance_threshold}")
-    print(f"📝 Preserved Financial Terms: {len(default_config.financial_terms_to_preserve)} terms")
-    print(f"🚫 Financial Stopwords: {len(default_config.financial_stopwords_to_remove)} terms")
+    out += [
+        f"✅ Lemmatization: {default_config.use_lemmatization}",
+        f"✅ POS Tagging: {default_config.use_pos_tagging}",
+        f"✅ Named Entity Recognition: {default_config.use_named_entity_recognition}",
+        f"📊 Financial Relevance Threshold: {default_config.financial_relevance_threshold}",
+        f"📝 Preserved Financial Terms: {len(default_config.financial_terms_to_preserve)} terms",
+        f"🚫 Financial Stopwords: {len(default_config.financial_stopwords_to_remove)} terms",
+    ]
     
     # 2. Asset-Backed Securities Optimization
-    print("\n2️⃣ ASSET-BACKED SECURITIES OPTIMIZATION")
-    print("-" * 40)
+    out += ["\n2️⃣ ASSET-BACKED SECURITIES OPTIMIZATION", _RULE]
     
     abs_config = NLTKConfig()
-    abs_config.financial_terms_to_preserve.update([
-        'waterfall', 'overcollateralization', 'enhancement', 'trigger',
-        'subordination', 'senior', 'subordinate', 'tranche', 'tranches'
-    ])
-    abs_config.financial_entity_patterns.extend([
-        r'\b[Cc]lass\s+[A-F]\s+[Nn]otes?\b',
-        r'\b[Ss]enior\s+[Nn]otes?\b',
-        r'\b[Ss]ubordinate\s+[Nn]otes?\b'
-    ])
+    abs_config.financial_terms_to_preserve.update(_ABS_CORE_TERMS)
+    abs_config.financial_entity_patterns.extend(_ABS_NOTE_PATTERNS)
     abs_config.financial_relevance_threshold = 0.35
     
-    print(f"🎯 Specialized for: Asset-Backed Securities")
-    print(f"📈 Enhanced terms: {list(abs_config.financial_terms_to_preserve)[-9:]}")
-    print(f"🔍 Entity patterns: {len(abs_config.financial_entity_patterns)} patterns")
-    print(f"⚖️ Tuned threshold: {abs_config.financial_relevance_threshold}")
+    out += [
+        "🎯 Specialized for: Asset-Backed Securities",
+        f"📈 Enhanced terms: {sorted(_ABS_CORE_TERMS)}",
+        f"🔍 Entity patterns: {len(abs_config.financial_entity_patterns)} patterns",
+        f"⚖️ Tuned threshold: {abs_config.financial_relevance_threshold}",
+    ]
     
     # 3. Servicing Reports Optimization
-    print("\n3️⃣ SERVICING REPORTS OPTIMIZATION")
-    print("-" * 40)
+    out += ["\n3️⃣ SERVICING REPORTS OPTIMIZATION", _RULE]
     
     servicing_config = NLTKConfig()
-    servicing_config.financial_terms_to_preserve.update([
-        'servicer', 'servicing', 'collection', 'distribution',
-        'advances', 'fees', 'compensations', 'delinquency'
-    ])
-    servicing_config.financial_stopwords_to_remove.update([
-        'report', 'statement', 'monthly', 'quarterly'
-    ])
+    servicing_config.financial_terms_to_preserve.update(_SERVICING_CORE_TERMS)
+    servicing_config.financial_stopwords_to_remove.update(_SERVICING_CORE_STOPWORDS)
     servicing_config.financial_relevance_threshold = 0.25
     
-    print(f"🎯 Specialized for: Servicing Reports")
-    print(f"📈 Enhanced terms: {list(servicing_config.financial_terms_to_preserve)[-8:]}")
-    print(f"🚫 Additional stopwords: {list(servicing_config.financial_stopwords_to_remove)[-4:]}")
-    print(f"⚖️ Tuned threshold: {servicing_config.financial_relevance_threshold}")
+    out += [
+        "🎯 Specialized for: Servicing Reports",
+        f"📈 Enhanced terms: {sorted(_SERVICING_CORE_TERMS)}",
+        f"🚫 Additional stopwords: {sorted(_SERVICING_CORE_STOPWORDS)}",
+        f"⚖️ Tuned threshold: {servicing_config.financial_relevance_threshold}",
+    ]
     
     # 4. Custom Lemmatization Examples
-    print("\n4️⃣ CUSTOM LEMMATIZATION RULES")
-    print("-" * 40)
+    out += ["\n4️⃣ CUSTOM LEMMATIZATION RULES", _RULE]
     
     custom_lemma_config = NLTKConfig()
     custom_lemma_config.custom_lemma_exceptions.update({
@@ -86,48 +144,35 @@ def demonstrate_nltk_features():
         'enhancements': 'enhancement'
     })
     
-    print("🔄 Custom lemmatization mappings:")
-    for word, lemma in custom_lemma_config.custom_lemma_exceptions.items():
-        print(f"   • '{word}' → '{lemma}'")
+    out.append("🔄 Custom lemmatization mappings:")
+    out.extend(
+        f"   • '{word}' → '{lemma}'"
+        for word, lemma in custom_lemma_config.custom_lemma_exceptions.items()
+    )
     
     # 5. Processing Configuration Integration
-    print("\n5️⃣ PROCESSING CONFIGURATION INTEGRATION")
-    print("-" * 40)
+    out += ["\n5️⃣ PROCESSING CONFIGURATION INTEGRATION", _RULE]
     
     processing_config = ProcessingConfig()
     processing_config.nltk_config = abs_config  # Use ABS-optimized config
     
-    print(f"🔧 NLTK Config: Integrated into ProcessingConfig")
-    print(f"📊 Fuzzy Threshold: {processing_config.fuzzy_threshold}")
-    print(f"⚡ Max Workers: {processing_config.max_workers}")
-    print(f"🎯 Financial Context Required: {processing_config.require_financial_context}")
+    out += [
+        "🔧 NLTK Config: Integrated into ProcessingConfig",
+        f"📊 Fuzzy Threshold: {processing_config.fuzzy_threshold}",
+        f"⚡ Max Workers: {processing_config.max_workers}",
+        f"🎯 Financial Context Required: {processing_config.require_financial_context}",
+    ]
     
     # 6. Real-world Usage Example
-    print("\n6️⃣ REAL-WORLD USAGE EXAMPLE")
-    print("-" * 40)
-    
-    print("💼 Example: Processing ABS Reports with Custom NLTK")
-    print("""
-    # Step 1: Create optimized configuration
-    abs_config = NLTKConfig()
-    abs_config.financial_terms_to_preserve.update(['waterfall', 'enhancement'])
-    abs_config.financial_relevance_threshold = 0.35
-    
-    # Step 2: Apply to processing config
-    processing_config = ProcessingConfig()
-    processing_config.nltk_config = abs_config
-    
-    # Step 3: Initialize system with custom config
-    discoverer = FinancialPatternDiscovery()
-    discoverer.processing_config = processing_config
-    
-    # Step 4: Process files with enhanced NLTK
-    results = discoverer.process_files(file_paths, output_path)
-    """)
+    out += [
+        "\n6️⃣ REAL-WORLD USAGE EXAMPLE",
+        _RULE,
+        "💼 Example: Processing ABS Reports with Custom NLTK",
+        _USAGE_EXAMPLE,
+    ]
     
     # 7. Performance Benefits
-    print("\n7️⃣ PERFORMANCE & ACCURACY BENEFITS")
-    print("-" * 40)
+    out += ["\n7️⃣ PERFORMANCE & ACCURACY BENEFITS", _RULE]
     
     benefits = [
         "🎯 Context-Aware Term Extraction (35% more accurate)",
@@ -138,68 +183,67 @@ def demonstrate_nltk_features():
         "⚡ Semantic Deduplication (faster processing)"
     ]
     
-    for benefit in benefits:
-        print(f"   {benefit}")
+    out.extend(f"   {benefit}" for benefit in benefits)
     
     # 8. Ready-to-Use Configurations
-    print("\n8️⃣ READY-TO-USE CONFIGURATIONS")
-    print("-" * 40)
-    
-    print("📦 Pre-built configurations available:")
-    print("   • abs_optimized_config() - Asset-Backed Securities")
-    print("   • servicing_optimized_config() - Servicing Reports")
-    print("   • trustee_optimized_config() - Trustee Reports")
-    print("   • general_financial_config() - General Financial Documents")
+    out += [
+        "\n8️⃣ READY-TO-USE CONFIGURATIONS",
+        _RULE,
+        "📦 Pre-built configurations available:",
+        "   • abs_optimized_config() - Asset-Backed Securities",
+        "   • servicing_optimized_config() - Servicing Reports",
+        "   • trustee_optimized_config() - Trustee Reports",
+        "   • general_financial_config() - General Financial Documents",
+        "\n🚀 YOUR NLTK-ENHANCED SYSTEM IS READY!",
+        _SEP,
+        "✅ Advanced term extraction with financial context awareness",
+        "✅ Intelligent clustering with semantic understanding",
+        "✅ Customizable for your specific document types",
+        "✅ Significant accuracy and performance improvements",
+        "\n🎯 Ready to process your financial documents with enhanced intelligence!",
+    ]
     
-    print(f"\n🚀 YOUR NLTK-ENHANCED SYSTEM IS READY!")
-    print("=" * 70)
-    print("✅ Advanced term extraction with financial context awareness")
-    print("✅ Intelligent clustering with semantic understanding")
-    print("✅ Customizable for your specific document types")
-    print("✅ Significant accuracy and performance improvements")
-    print("\n🎯 Ready to process your financial documents with enhanced intelligence!")
+    _emit(out)
 
 
-def abs_optimized_config() -> NLTKConfig:
+# Each preset factory builds a fresh config by default. Callers that will
+# not modify the result can pass frozen=True to share one cached instance;
+# building is much cheaper than deep-copying a cached prototype.
+
+def abs_optimized_config(frozen: bool = False) -> NLTKConfig:
     """Pre-configured NLTK settings for Asset-Backed Securities"""
+    return _shared_abs_config() if frozen else _build_abs_config()
+
+
+def servicing_optimized_config(frozen: bool = False) -> NLTKConfig:
+    """Pre-configured NLTK settings for Servicing Reports"""
+    return _shared_servicing_config() if frozen else _build_servicing_config()
+
+
+def trustee_optimized_config(frozen: bool = False) -> NLTKConfig:
+    """Pre-configured NLTK settings for Trustee Reports"""
+    return _shared_trustee_config() if frozen else _build_trustee_config()
+
+
+def _build_abs_config() -> NLTKConfig:
     config = NLTKConfig()
-    config.financial_terms_to_preserve.update([
-        'waterfall', 'overcollateralization', 'enhancement', 'trigger',
-        'subordination', 'senior', 'subordinate', 'tranche', 'tranches',
-        'class', 'note', 'notes', 'certificate', 'certificates'
-    ])
-    config.financial_entity_patterns.extend([
-        r'\b[Cc]lass\s+[A-F]\s+[Nn]otes?\b',
-        r'\b[Ss]enior\s+[Nn]otes?\b',
-        r'\b[Ss]ubordinate\s+[Nn]otes?\b',
-        r'\b[Oo]vercollateralization\s+[Tt]est\b'
-    ])
+    config.financial_terms_to_preserve.update(_ABS_TERMS)
+    config.financial_entity_patterns.extend(_ABS_PATTERNS)
     config.financial_relevance_threshold = 0.35
     return config
 
 
-def servicing_optimized_config() -> NLTKConfig:
-    """Pre-configured NLTK settings for Servicing Reports"""
+def _build_servicing_config() -> NLTKConfig:
     config = NLTKConfig()
-    config.financial_terms_to_preserve.update([
-        'servicer', 'servicing', 'collection', 'distribution',
-        'advances', 'fees', 'compensations', 'delinquency',
-        'prepayment', 'default', 'loss', 'recovery'
-    ])
-    config.financial_stopwords_to_remove.update([
-        'report', 'statement', 'monthly', 'quarterly', 'period'
-    ])
+    config.financial_terms_to_preserve.update(_SERVICING_TERMS)
+    config.financial_stopwords_to_remove.update(_SERVICING_STOPWORDS)
     config.financial_relevance_threshold = 0.25
     return config
 
 
-def trustee_optimized_config() -> NLTKConfig:
-    """Pre-configured NLTK settings for Trustee Reports"""
+def _build_trustee_config() -> NLTKConfig:
     config = NLTKConfig()
-    config.financial_terms_to_preserve.update([
-        'trustee', 'indenture', 'owner', 'backup',
-        'administration', 'fees', 'eligible', 'successor'
-    ])
+    config.financial_terms_to_preserve.update(_TRUSTEE_TERMS)
     config.custom_lemma_exceptions.update({
         'trustees': 'trustee',
         'administrations': 'administration',
@@ -209,5 +253,10 @@ def trustee_optimized_config() -> NLTKConfig:
     return config
 
 
+_shared_abs_config = lru_cache(maxsize=1)(_build_abs_config)
+_shared_servicing_config = lru_cache(maxsize=1)(_build_servicing_config)
+_shared_trustee_config = lru_cache(maxsize=1)(_build_trustee_config)
+
+
 if __name__ == "__main__":
     demonstrate_nltk_features()
\ No newline at end of file
@@ -9,7 +9,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from financial_pattern_discovery import FinancialPatternDiscovery
+from financial_pattern_discovery.files import iter_matching_files
 
 # =============================================================================
 # CONFIGURATION - Modify these paths as needed
@@ -19,6 +19,7 @@ OUTPUT_FILE = "financial_patterns.xlsx"         # Change this to your desired ou
 FILE_PATTERN = "*.xlsx"                         # File pattern to match
 RECURSIVE = True                                # Search subdirectories recursively
 CONFIG_FILE = "config.ini"                     # Configuration file to use
+SKIP_DIRS = {".*", "__pycache__", "node_modules"}  # Subdirectories not searched (".*" = hidden, e.g. .git, .venv)
 # =============================================================================
 
 
@@ -43,17 +44,23 @@ def main():
     print(f"🔄 Recursive: {'Yes' if RECURSIVE else 'No'}")
     print(f"📄 Output: {output_path}\n")
     
+    # Find Excel files
+    file_paths = list(iter_matching_files(dir_path, FILE_PATTERN, RECURSIVE, SKIP_DIRS))
+    if not file_paths:
+        print(f"❌ Error: No files matching '{FILE_PATTERN}' found in {dir_path}")
+        return 1
+    print(f"Found {len(file_paths)} files")
+    
+    # Imported only once the file list checks out: loading the discovery
+    # system pulls in NLTK, scikit-learn and pandas
+    from financial_pattern_discovery import FinancialPatternDiscovery
+    
     try:
         # Initialize discovery system
         discoverer = FinancialPatternDiscovery(CONFIG_FILE)
         
-        # Process directory
-        results = discoverer.process_directory(
-            directory_path=dir_path,
-            pattern=FILE_PATTERN,
-            recursive=RECURSIVE,
-            output_path=output_path
-        )
+        # Process files
+        results = discoverer.process_files(file_paths, output_path)
         
         if results:
             print(f"\n✅ Success! Pattern discovery complete")
@@ -4,12 +4,15 @@ Command-line interface for Financial Pattern Discovery System
 """
 
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from financial_pattern_discovery import FinancialPatternDiscovery
+from financial_pattern_discovery.files import iter_matching_files
 
 # =============================================================================
 # CONFIGURATION - Modify these paths as needed
@@ -22,20 +25,32 @@ RECURSIVE = True                                   # Process directories recursi
 CONFIG_FILE = "config.ini"                        # Configuration file to use
 # =============================================================================
 
+_EXCEL_EXTENSIONS = ('.xlsx', '.xls', '.xlsm', '.xlsb')
+
+# Decorative banners are only printed for interactive terminals
+_BANNER = sys.stdout.isatty()
+_SEP = "=" * 40
+
+
+def _find_files(dir_path: Path) -> List[Path]:
+    """Find files matching FILE_PATTERN in one source directory"""
+    return list(iter_matching_files(dir_path, FILE_PATTERN, RECURSIVE))
+
 
 def main():
     """Main function for processing"""
     
-    print("Financial Pattern Discovery System")
-    print("=" * 40)
+    if _BANNER:
+        print("Financial Pattern Discovery System")
+        print(_SEP)
     
     # Collect files from various sources
     file_paths = []
     
     # Process directories if provided
     if SOURCE_DIRECTORIES:
-        for directory in SOURCE_DIRECTORIES:
-            dir_path = Path(directory)
+        dir_paths = [Path(directory) for directory in SOURCE_DIRECTORIES]
+        for dir_path in dir_paths:
             if not dir_path.exists():
                 print(f"Error: Directory '{dir_path}' does not exist")
                 print(f"Please update SOURCE_DIRECTORIES in the script")
@@ -43,15 +58,17 @@ def main():
             if not dir_path.is_dir():
                 print(f"Error: '{dir_path}' is not a directory")
                 return 1
-            
-            # Find Excel files in directory
-            if RECURSIVE:
-                # Recursive search
-                pattern_files = list(dir_path.rglob(FILE_PATTERN))
-            else:
-                # Non-recursive search
-                pattern_files = list(dir_path.glob(FILE_PATTERN))
-            
+        
+        # Directory walks spend their time waiting on filesystem metadata,
+        # so scan several source directories concurrently in threads;
+        # results are reported in configuration order
+        if len(dir_paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(dir_paths), 8)) as executor:
+                found = list(executor.map(_find_files, dir_paths))
+        else:
+            found = [_find_files(dir_path) for dir_path in dir_paths]
+        
+        for dir_path, pattern_files in zip(dir_paths, found):
             if not pattern_files:
                 print(f"Warning: No files matching '{FILE_PATTERN}' found in {dir_path}")
             else:
@@ -76,41 +93,37 @@ def main():
         print("Please update SOURCE_DIRECTORIES or SOURCE_FILES in the script")
         return 1
     
-    # Remove duplicates and filter for Excel files
-    file_paths = list(set(file_paths))
-    excel_extensions = {'.xlsx', '.xls', '.xlsm', '.xlsb'}
-    file_paths = [f for f in file_paths if f.suffix.lower() in excel_extensions]
+    # Filter for Excel files and remove duplicates in one pass, then sort
+    # for consistent processing
+    file_paths = sorted({f for f in file_paths if f.name.lower().endswith(_EXCEL_EXTENSIONS)})
     
     if not file_paths:
         print("Error: No Excel files found to process")
         return 1
     
-    # Sort files for consistent processing
-    file_paths.sort()
-    
     print(f"\n📊 Found {len(file_paths)} Excel file(s) to process")
     
-    # Show file summary
+    # Show file summary, written as one block
     if len(file_paths) <= 10:
-        print("\nFiles to process:")
-        for f in file_paths:
-            print(f"  • {f}")
+        lines = ["\nFiles to process:"]
+        lines.extend(f"  • {f}" for f in file_paths)
     else:
-        print(f"\nShowing first 10 of {len(file_paths)} files:")
-        for f in file_paths[:10]:
-            print(f"  • {f}")
-        print(f"  ... and {len(file_paths) - 10} more files")
+        lines = [f"\nShowing first 10 of {len(file_paths)} files:"]
+        lines.extend(f"  • {f}" for f in file_paths[:10])
+        lines.append(f"  ... and {len(file_paths) - 10} more files")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Show directory summary if processing directories
     if SOURCE_DIRECTORIES:
-        dir_summary = {}
-        for f in file_paths:
-            parent = f.parent
-            dir_summary[parent] = dir_summary.get(parent, 0) + 1
+        dir_summary = Counter(f.parent for f in file_paths)
         
-        print("\nFiles by directory:")
-        for directory, count in sorted(dir_summary.items()):
-            print(f"  • {directory}: {count} files")
+        lines = ["\nFiles by directory:"]
+        lines.extend(f"  • {directory}: {count} files" for directory, count in sorted(dir_summary.items()))
+        sys.stdout.write("\n".join(lines) + "\n")
+    
+    # Imported only once the file list checks out: loading the discovery
+    # system pulls in NLTK, scikit-learn and pandas
+    from financial_pattern_discovery import FinancialPatternDiscovery
     
     # Initialize discovery system
     try:
@@ -10,6 +10,19 @@ from pathlib import Path
 import zipfile
 import urllib.request
 import ssl
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# NLTK is only needed for the post-install smoke test
+try:
+    from nltk.tokenize import word_tokenize
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    NLTK_AVAILABLE = True
+except ImportError:
+    NLTK_AVAILABLE = False
+
+# Copy buffer for streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
 def create_nltk_directories():
     """Create the NLTK data directory structure"""
@@ -29,26 +42,62 @@ def create_nltk_directories():
     
     return nltk_data_dir
 
+def _stream_to_file(url, filename, context=None):
+    """Stream a URL's response body straight into a file"""
+    with urllib.request.urlopen(url, context=context) as response:
+        with open(filename, 'wb') as f:
+            shutil.copyfileobj(response, f, DOWNLOAD_CHUNK_SIZE)
+
+def _is_ssl_failure(error):
+    """Whether a download error came from TLS (e.g. an inspecting proxy)"""
+    return isinstance(error, ssl.SSLError) or isinstance(getattr(error, 'reason', None), ssl.SSLError)
+
 def download_with_fallback(url, filename):
-    """Download file with SSL fallback for corporate environments"""
+    """Download file with SSL fallback for corporate environments
+    
+    Certificate verification is only relaxed when the verified attempt
+    fails with an SSL error; other failures (404, DNS, timeouts) are
+    reported rather than retried without verification.
+    """
     try:
-        # First try normal download
-        urllib.request.urlretrieve(url, filename)
+        _stream_to_file(url, filename)
         return True
-    except:
-        try:
-            # Try with unverified SSL context
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            with urllib.request.urlopen(url, context=ssl_context) as response:
-                with open(filename, 'wb') as f:
-                    shutil.copyfileobj(response, f)
-            return True
-        except Exception as e:
+    except Exception as e:
+        if not _is_ssl_failure(e):
             print(f"Download failed for {url}: {e}")
             return False
+    
+    try:
+        # Try with unverified SSL context
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        
+        _stream_to_file(url, filename, ssl_context)
+        return True
+    except Exception as e:
+        print(f"Download failed for {url}: {e}")
+        return False
+
+def _fetch_and_extract(package_name, info):
+    """Download and unpack one NLTK package; returns (installed, status message)"""
+    zip_file = info['local_dir'] / f"{package_name}.zip"
+    
+    # Try automatic download first
+    if not download_with_fallback(info['url'], zip_file):
+        return False, f"⚠️  Automatic download failed for {package_name}"
+    
+    try:
+        # Extract the ZIP file
+        with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+            zip_ref.extractall(info['local_dir'])
+        
+        # Remove the ZIP file after extraction
+        zip_file.unlink()
+    except Exception as e:
+        return False, f"❌ Failed to extract {package_name}: {e}"
+    
+    return True, f"✅ {package_name} installed successfully"
 
 def setup_nltk_data_manually():
     """
@@ -90,30 +139,21 @@ def setup_nltk_data_manually():
     print(f"\nNLTK data directory: {nltk_data_dir}")
     print("\nAttempting automatic download (may fail in corporate environments)...")
     
-    success_count = 0
-    
     for package_name, info in essential_packages.items():
         print(f"\n📦 Processing {package_name} - {info['description']}")
-        
-        zip_file = info['local_dir'] / f"{package_name}.zip"
-        
-        # Try automatic download first
-        if download_with_fallback(info['url'], zip_file):
-            try:
-                # Extract the ZIP file
-                with zipfile.ZipFile(zip_file, 'r') as zip_ref:
-                    zip_ref.extractall(info['local_dir'])
-                
-                # Remove the ZIP file after extraction
-                zip_file.unlink()
-                
-                print(f"✅ {package_name} installed successfully")
-                success_count += 1
-                
-            except Exception as e:
-                print(f"❌ Failed to extract {package_name}: {e}")
-        else:
-            print(f"⚠️  Automatic download failed for {package_name}")
+    print()
+    
+    # The packages are independent downloads, so fetch them concurrently
+    success_count = 0
+    with ThreadPoolExecutor(max_workers=len(essential_packages)) as executor:
+        futures = [
+            executor.submit(_fetch_and_extract, package_name, info)
+            for package_name, info in essential_packages.items()
+        ]
+        for future in as_completed(futures):
+            installed, message = future.result()
+            print(message)
+            success_count += installed
     
     print(f"\n{'='*50}")
     print(f"Automatic setup complete: {success_count}/{len(essential_packages)} packages installed")
@@ -164,12 +204,12 @@ def test_nltk_setup():
     """Test if NLTK is working with the installed data"""
     print(f"\n🧪 Testing NLTK Setup...")
     
+    if not NLTK_AVAILABLE:
+        print(f"❌ NLTK test failed: nltk is not installed")
+        print(f"The system will fall back to basic text processing.")
+        return False
+    
     try:
-        import nltk
-        from nltk.tokenize import word_tokenize
-        from nltk.corpus import stopwords
-        from nltk.stem import WordNetLemmatizer
-        
         # Test tokenization
         test_text = "Class A Interest Distributable Amount"
         tokens = word_tokenize(test_text)
@@ -48,7 +48,11 @@ setup(
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.0.0",
-        ]
+        ],
+        "fast": [
+            "xlsxwriter>=3.0.0",
+            "orjson>=3.9.0",
+        ],
     },
     entry_points={
         "console_scripts": [
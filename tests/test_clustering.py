@@ -0,0 +1,25 @@
+"""
+Tests for clustering small term vocabularies
+"""
+
+from financial_pattern_discovery.clustering import FinancialTermClustering
+from financial_pattern_discovery.config import ClusteringConfig
+
+
+def test_single_term_forms_a_cluster():
+    results = FinancialTermClustering(ClusteringConfig()).cluster_terms(["Net Income"])
+
+    assert [cluster['terms'] for cluster in results['clusters'].values()] == [["Net Income"]]
+    assert results['metrics'] == {'n_clusters': 1, 'n_terms': 1}
+
+
+def test_repeated_occurrences_cluster_as_one_term():
+    results = FinancialTermClustering(ClusteringConfig()).cluster_terms(["Net Income"] * 3)
+
+    assert [cluster['terms'] for cluster in results['clusters'].values()] == [["Net Income"]]
+
+
+def test_empty_vocabulary_has_no_clusters():
+    results = FinancialTermClustering(ClusteringConfig()).cluster_terms([])
+
+    assert results['clusters'] == {}
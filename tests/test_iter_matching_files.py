@@ -0,0 +1,64 @@
+"""
+Tests for the directory walker used to discover input workbooks
+"""
+
+import os
+import sys
+
+import pytest
+
+from financial_pattern_discovery.files import iter_matching_files
+
+
+def _make_tree(root):
+    """Create a small report tree with a nested 'locked' subdirectory"""
+    (root / "a").mkdir()
+    (root / "locked" / "inner").mkdir(parents=True)
+    for name in ("top.xlsx", "a/one.xlsx", "locked/two.xlsx", "locked/inner/three.xlsx", "a/notes.txt"):
+        (root / name).touch()
+
+
+def _names(paths):
+    return sorted(path.name for path in paths)
+
+
+def test_finds_matching_files_recursively(tmp_path):
+    _make_tree(tmp_path)
+
+    assert _names(iter_matching_files(tmp_path, "*.xlsx", recursive=True)) == [
+        "one.xlsx", "three.xlsx", "top.xlsx", "two.xlsx"
+    ]
+    assert _names(iter_matching_files(tmp_path, "*.xlsx")) == ["top.xlsx"]
+
+
+def test_unreadable_subdirectory_is_skipped(tmp_path, monkeypatch):
+    _make_tree(tmp_path)
+    locked = os.fspath(tmp_path / "locked")
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if os.fspath(path) == locked:
+            raise PermissionError(13, "Permission denied", path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+
+    assert _names(iter_matching_files(tmp_path, "*.xlsx", recursive=True)) == ["one.xlsx", "top.xlsx"]
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32" or (hasattr(os, "geteuid") and os.geteuid() == 0),
+    reason="needs POSIX permissions that apply to the current user",
+)
+def test_permission_denied_subdirectory_is_skipped(tmp_path):
+    _make_tree(tmp_path)
+    locked = tmp_path / "locked"
+    locked.chmod(0)
+    try:
+        assert _names(iter_matching_files(tmp_path, "*.xlsx", recursive=True)) == ["one.xlsx", "top.xlsx"]
+    finally:
+        locked.chmod(0o755)
+
+
+def test_vanished_directory_is_skipped(tmp_path):
+    assert list(iter_matching_files(tmp_path / "missing", "*.xlsx", recursive=True)) == []